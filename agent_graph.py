@@ -1,5 +1,6 @@
 from typing import TypedDict, Annotated, List, Dict
 from langgraph.graph import StateGraph, END
+from config import Config
 # from langgraph.prebuilt import ToolExecutor
 
 # Define the State
@@ -8,85 +9,104 @@ class AgentState(TypedDict):
     found_jobs: List[Dict]
     current_job: Dict
     application_status: str
+    applications: List[Dict]
     outreach_targets: List[Dict]
     logs: List[str]
 
 # Define Nodes
+_browser_session = None
+
+def get_browser_session():
+    """Process-wide browser session: Chromium is launched and logged in once, then shared by all nodes."""
+    global _browser_session
+    if _browser_session is None:
+        from browser_session import BrowserSession
+        _browser_session = BrowserSession()
+    return _browser_session
+
 def search_jobs(state: AgentState):
     print("--- Searching for Jobs ---")
-    import asyncio
-    from browser_manager import BrowserManager
-    
-    # We need to run async browser code in this sync node
-    # For now, we instantiate a fresh manager or reuse one if global
-    # Ideally, we inject the browser_manager, but for this prototype:
-    
-    async def run_search():
-        bm = BrowserManager()
-        # Criteria from state or default
-        query = state.get("job_search_criteria", {}).get("query", "Software Engineer")
-        location = state.get("job_search_criteria", {}).get("location", "United States")
-        
-        jobs = await bm.search_jobs(query, location)
-        await bm.close()
-        return jobs
-
-    found_jobs = asyncio.run(run_search())
+    # Criteria from state or default
+    query = state.get("job_search_criteria", {}).get("query", "Software Engineer")
+    location = state.get("job_search_criteria", {}).get("location", "United States")
+    
+    try:
+        found_jobs = get_browser_session().run(lambda browser: browser.search_jobs(query, location))
+    except Exception as e:
+        print(f"Search failed: {e}")
+        found_jobs = []
     return {"found_jobs": found_jobs}
 
+_job_scorer = None
+
+def get_job_scorer():
+    """Long-lived scoring service, so provider clients and the DB session are reused across runs."""
+    global _job_scorer
+    if _job_scorer is None:
+        from job_scoring import create_job_scoring_service
+        _job_scorer = create_job_scoring_service()
+    return _job_scorer
+
+_application_queue = None
+
+def get_application_queue():
+    """Application queue sharing the scoring service's DB session."""
+    global _application_queue
+    if _application_queue is None:
+        from application_queue import create_application_queue
+        _application_queue = create_application_queue(get_job_scorer().db)
+    return _application_queue
+
 def analyze_job(state: AgentState):
-    print("--- Analyzing Job ---")
-    from job_analyzer import create_job_analyzer
-    
-    analyzer = create_job_analyzer()
+    print("--- Analyzing Jobs ---")
     found_jobs = state.get("found_jobs", [])
     
     if not found_jobs:
         print("No jobs to analyze")
         return {"current_job": None}
     
-    # Analyze the first job (in real workflow, we'd loop through all)
-    job = found_jobs[0]
-    print(f"Analyzing: {job['title']} at {job['company']}")
+    # Score every job concurrently; failed jobs come back with a default low score
+    analyses = get_job_scorer().score_many(found_jobs)
     
-    analysis = analyzer.analyze(job)
+    for job, analysis in zip(found_jobs, analyses):
+        # Add analysis to job data
+        job["score"] = analysis["score"]
+        job["analysis"] = analysis
+        print(f"{analysis['score']:>3}/100  {job['title']} at {job['company']}")
     
-    # Add analysis to job data
-    job["score"] = analysis["score"]
-    job["analysis"] = analysis
+    queue = get_application_queue()
+    queued = queue.push_scored(found_jobs)
+    print(f"Queued {queued} new jobs to apply to ({len(queue)} waiting)")
     
-    print(f"Score: {analysis['score']}/100")
-    print(f"Reason: {analysis['reason']}")
-    print(f"Should Apply: {analysis['should_apply']}")
+    best = max(found_jobs, key=lambda job: (job["analysis"]["should_apply"], job["score"]))
+    print(f"Best match: {best['title']} at {best['company']} ({best['score']}/100)")
+    print(f"Reason: {best['analysis']['reason']}")
+    print(f"Should Apply: {best['analysis']['should_apply']}")
     
-    return {"current_job": job}
+    return {"found_jobs": found_jobs, "current_job": best}
 
 def apply_to_job(state: AgentState):
-    print("--- Applying to Job ---")
+    print("--- Applying to Jobs ---")
     from form_filler import create_form_filler
     
-    job = state.get("current_job")
-    if not job:
-        print("No job to apply to")
-        return {"application_status": "no_job"}
-    
-    # Check if should apply based on score
-    should_apply = job.get("analysis", {}).get("should_apply", False)
-    if not should_apply:
-        print(f"Skipping application (score too low: {job.get('score', 0)})")
-        return {"application_status": "skipped_low_score"}
-    
-    print(f"Applying to: {job['title']} at {job['company']}")
-    
-    # Get browser from state
-    browser = state.get("browser")
-    if not browser:
-        print("No browser instance available")
-        return {"application_status": "error_no_browser"}
-    
-    async def apply():
+    # Best-scored jobs first, until today's budget is spent
+    queue = get_application_queue()
+    remaining = queue.remaining_today()
+    if remaining <= 0:
+        print(f"Daily limit reached ({queue.max_per_day} applications)")
+        return {"application_status": "daily_limit_reached", "applications": []}
+    if len(queue) == 0:
+        print("No jobs to apply to")
+        return {"application_status": "no_job", "applications": []}
+    print(f"{len(queue)} jobs queued, {remaining} applications left today")
+    
+    from browser_session import BrowserSessionError
+    session = get_browser_session()
+    form_filler = create_form_filler()
+    
+    async def open_form(browser, job_url):
         # Navigate to job
-        success = await browser.navigate_to_job(job["url"])
+        success = await browser.navigate_to_job(job_url)
         if not success:
             return "error_navigation"
         
@@ -99,35 +119,76 @@ def apply_to_job(state: AgentState):
         clicked = await browser.click_easy_apply()
         if not clicked:
             return "error_click"
-        
-        # Detect form fields
-        fields = await browser.detect_form_fields()
-        if len(fields) > 10:
-            print(f"Form too complex ({len(fields)} fields), skipping")
-            return "skipped_complex_form"
-        
-        # Fill each field
-        form_filler = create_form_filler()
-        for field in fields:
-            answer = form_filler.get_answer(field)
+        return None
+    
+    async def fill_and_submit(browser, fields, answers):
+        for field, answer in zip(fields, answers):
             if answer:
                 await browser.fill_form_field(field, answer)
             else:
                 print(f"  Skipped field (no answer): {field['label']}")
+        return await browser.submit_application()
+    
+    def apply(job_url):
+        # Browser steps run in the session; answering (LLM + memory DB) runs on this thread
+        status = session.run(lambda browser: open_form(browser, job_url))
+        if status:
+            return status
+        
+        # Multi-step forms: fill each step, then Next/Review until Submit
+        for _ in range(Config.EASY_APPLY_MAX_STEPS):
+            # Detect form fields
+            fields = session.run(lambda browser: browser.detect_form_fields())
+            if len(fields) > 10:
+                print(f"Form too complex ({len(fields)} fields), skipping")
+                return "skipped_complex_form"
+            
+            # Answer all fields at once (memory first, then one LLM request), then fill.
+            # File inputs are left alone: LinkedIn pre-attaches the profile resume.
+            fields = [field for field in fields if field["type"] != "file"]
+            answers = form_filler.get_answers(fields)
+            
+            # Submit, or move to the next step
+            step = session.run(lambda browser: fill_and_submit(browser, fields, answers))
+            if step == "submitted":
+                return "submitted"
+            if step == "stuck":
+                return "error_form_incomplete"  # The form did not advance, e.g. a required field is empty
+            if step != "next":
+                return "error_submit"  # No submit button, or the click failed
+        return "error_too_many_steps"
+    
+    results = []
+    attempted = set()  # A job re-queued after a failure waits for the next run
+    while True:
+        job = queue.pop(exclude=attempted)
+        if job is None:
+            break
+        attempted.add(job.id)
+        
+        print(f"Applying to: {job.title} at {job.company} (score {job.fit_score:.2f})")
+        try:
+            status = apply(job.url)
+        except BrowserSessionError as e:
+            # Startup or login failed: not the job's fault, and every other job would fail too
+            print(f"Browser session failed, stopping: {e}")
+            queue.release(job)
+            results.append({"job_id": job.platform_job_id, "title": job.title, "status": "error_session"})
+            break
+        except Exception as e:
+            print(f"Error applying: {e}")
+            status = "error"
         
-        # Submit
-        submitted = await browser.submit_application()
-        if submitted:
-            return "submitted"
+        if status in ("no_easy_apply", "skipped_complex_form"):
+            queue.discard(job)
         else:
-            return "error_submit"
-    
-    # Run async function
-    import asyncio
-    status = asyncio.run(apply())
+            queue.complete(job, submitted=status == "submitted")
+        
+        print(f"Application status: {status}")
+        results.append({"job_id": job.platform_job_id, "title": job.title, "status": status})
     
-    print(f"Application status: {status}")
-    return {"application_status": status}
+    status = results[-1]["status"] if results else "no_job"
+    return {"application_status": status, "applications": results}
 
 def networking(state: AgentState):
     print("--- Networking Step ---")
@@ -1,36 +1,181 @@
+import atexit
 import json
+import threading
+import time
+import weakref
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from collections import Counter
+from typing import Optional, Dict, Any, List, Set, Tuple
+import numpy as np
+from memory_store import SQLiteMemoryStore
+from semantic_index import HashedNgramEmbedder, SemanticIndex, content_words
 from config import Config
 from difflib import SequenceMatcher
 
+# Live memories, flushed by one exit handler (a handler per instance would keep every instance alive)
+_open_memories: "weakref.WeakSet[ApplicationMemory]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_memories():
+    for memory in list(_open_memories):
+        memory.flush()
+
+
 class ApplicationMemory:
     """
     Stores and retrieves answers to application questions.
     
+    Lookups use an in-memory index built at load time: a map from normalized
+    question to key for exact hits, and a character-trigram inverted index
+    that narrows fuzzy matching down to a few candidates. An optional
+    semantic tier (local hashed n-gram embeddings) catches paraphrases the
+    lexical tiers miss. Both similarity tiers only match a stored question
+    with the same content words, so "years of Java experience" never gets
+    the answer remembered for Python.
+    
+    Entries live in a SQLite store shared safely between concurrent runs;
+    the old JSON file is imported on first use. Usage stats from lookups
+    are written behind in batches.
+    
     SOLID Principles:
     - Single Responsibility: Only manages application Q&A memory
     - Open/Closed: Can extend with different storage backends
     """
     
-    def __init__(self, memory_path: Optional[Path] = None):
-        self.memory_path = memory_path or Config.DATA_DIR / "application_memory.json"
+    # Fuzzy candidates checked per lookup (those sharing the most trigrams)
+    MAX_FUZZY_CANDIDATES = 50
+    
+    def __init__(self, memory_path: Optional[Path] = None,
+                 embedder: Optional[HashedNgramEmbedder] = None):
+        """
+        Args:
+            memory_path: SQLite file. A JSON file with the same stem is imported once.
+                      If None, uses Config.APPLICATION_MEMORY_PATH.
+            embedder: Question embedder for the semantic tier. If None, a hashed
+                      n-gram embedder is used when Config.MEMORY_SEMANTIC_ENABLED.
+        """
+        if embedder is None and Config.MEMORY_SEMANTIC_ENABLED:
+            embedder = HashedNgramEmbedder(Config.MEMORY_EMBEDDING_DIM)
+        self._embedder = embedder
+        
+        path = memory_path or Config.APPLICATION_MEMORY_PATH
+        self.memory_path = path.with_suffix(".db")
+        self._store = SQLiteMemoryStore(self.memory_path)
+        imported = self._store.import_json(path.with_suffix(".json"))
+        if imported:
+            print(f"Imported {imported} answers from {path.with_suffix('.json')}")
+        
+        self._pending_usage: Dict[str, Tuple[int, str]] = {}
+        self._last_flush = time.monotonic()
+        self._usage_lock = threading.Lock()
         self._memory = self._load()
+        _open_memories.add(self)
     
     def _load(self) -> Dict[str, Any]:
-        """Load memory from JSON file."""
-        if not self.memory_path.exists():
-            return {"questions": {}, "metadata": {"created": datetime.now().isoformat()}}
+        """Load memory from the store and build the lookup index."""
+        memory = {"questions": self._store.load(), "metadata": self._store.get_metadata()}
+        self._build_index(memory["questions"])
+        return memory
+    
+    def _reload_if_changed(self) -> bool:
+        """Pick up answers another run stored since we loaded."""
+        if not self._store.changed_externally():
+            return False
+        self._memory = self._load()
+        return True
+    
+    def _record_use(self, key: str, data: Dict[str, Any]):
+        """Update usage stats in memory and queue them for a batched write."""
+        now = datetime.now().isoformat()
+        data["last_used"] = now
+        data["use_count"] = data.get("use_count", 0) + 1
+        
+        with self._usage_lock:
+            count, _ = self._pending_usage.get(key, (0, now))
+            self._pending_usage[key] = (count + 1, now)
+            due = (len(self._pending_usage) >= Config.MEMORY_USAGE_FLUSH_SIZE
+                   or time.monotonic() - self._last_flush >= Config.MEMORY_USAGE_FLUSH_SECONDS)
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Write pending usage stats to the store."""
+        with self._usage_lock:
+            pending, self._pending_usage = self._pending_usage, {}
+            self._last_flush = time.monotonic()
+        self._store.record_usage(pending)
+    
+    def close(self):
+        """Write pending usage stats; the exit handler no longer needs to."""
+        self.flush()
+        _open_memories.discard(self)
+    
+    # ===== INDEX =====
+    
+    def _trigrams(self, normalized: str) -> Set[str]:
+        padded = f"  {normalized} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def _build_index(self, questions: Dict[str, Any]):
+        self._exact: Dict[str, str] = {}  # normalized question -> key
+        self._normalized: Dict[str, str] = {}  # key -> normalized question
+        self._content: Dict[str, frozenset] = {}  # key -> content words of the question
+        self._order: Dict[str, int] = {}  # key -> insertion position (for tie-breaking)
+        self._postings: Dict[str, Set[str]] = {}  # trigram -> keys
+        for key, data in questions.items():
+            self._index_entry(key, data["question"])
+        self._build_semantic_index(questions)
+    
+    def _build_semantic_index(self, questions: Dict[str, Any]):
+        """Load stored embeddings and embed (and store) only the questions that lack one."""
+        self._semantic: Optional[SemanticIndex] = None
+        if self._embedder is None:
+            return
+        
+        self._semantic = SemanticIndex(self._embedder.dim)
+        stored = self._store.load_embeddings(self._embedder.name)
+        missing = [key for key in questions if key not in stored]
+        if missing:
+            vectors = self._embedder.embed([questions[key]["question"] for key in missing])
+            stored.update({key: vector.tobytes() for key, vector in zip(missing, vectors)})
+            self._store.upsert_embeddings(self._embedder.name, {key: stored[key] for key in missing})
+        
+        for key in questions:
+            self._semantic.add(key, np.frombuffer(stored[key], dtype=np.float32))
+    
+    def _index_entry(self, key: str, question: str):
+        if key in self._normalized:
+            self._unindex_entry(key)
         
-        with open(self.memory_path, 'r') as f:
-            return json.load(f)
+        normalized = self._normalize_question(question)
+        self._exact[normalized] = key
+        self._normalized[key] = normalized
+        self._content[key] = content_words(question)
+        # Overwriting a key keeps its position in the questions dict
+        self._order.setdefault(key, len(self._order))
+        for trigram in self._trigrams(normalized):
+            self._postings.setdefault(trigram, set()).add(key)
     
-    def _save(self):
-        """Save memory to JSON file."""
-        self._memory["metadata"]["last_updated"] = datetime.now().isoformat()
-        with open(self.memory_path, 'w') as f:
-            json.dump(self._memory, f, indent=2)
+    def _unindex_entry(self, key: str):
+        normalized = self._normalized.pop(key)
+        self._content.pop(key, None)
+        if self._exact.get(normalized) == key:
+            del self._exact[normalized]
+        for trigram in self._trigrams(normalized):
+            keys = self._postings.get(trigram)
+            if keys:
+                keys.discard(key)
+    
+    def _fuzzy_candidates(self, normalized: str) -> List[str]:
+        """Keys sharing the most trigrams with the question, in storage order."""
+        shared = Counter()
+        for trigram in self._trigrams(normalized):
+            shared.update(self._postings.get(trigram, ()))
+        
+        best = [key for key, _ in shared.most_common(self.MAX_FUZZY_CANDIDATES)]
+        return sorted(best, key=self._order.__getitem__)
     
     def _normalize_question(self, question: str) -> str:
         """Normalize question for matching."""
@@ -42,42 +187,66 @@ class ApplicationMemory:
                               self._normalize_question(q1), 
                               self._normalize_question(q2)).ratio()
     
-    def get_answer(self, question: str, similarity_threshold: float = 0.8) -> Optional[str]:
+    def get_answer(self, question: str, similarity_threshold: float = 0.8,
+                   semantic_threshold: Optional[float] = None) -> Optional[str]:
         """
         Get answer for a question, using fuzzy matching.
         
         Args:
             question: The question to find answer for
             similarity_threshold: Minimum similarity to consider a match (0-1)
+            semantic_threshold: Minimum cosine similarity for the semantic tier.
+                      If None, uses Config.MEMORY_SEMANTIC_THRESHOLD.
         
         Returns:
             Answer string if found, None otherwise
         """
         # Exact match first
         normalized = self._normalize_question(question)
-        for key, data in self._memory["questions"].items():
-            if self._normalize_question(data["question"]) == normalized:
-                data["last_used"] = datetime.now().isoformat()
-                data["use_count"] = data.get("use_count", 0) + 1
-                self._save()
-                return data["answer"]
-        
-        # Fuzzy match
-        best_match = None
+        key = self._exact.get(normalized)
+        if key is None and self._reload_if_changed():
+            key = self._exact.get(normalized)
+        if key is not None:
+            data = self._memory["questions"][key]
+            self._record_use(key, data)
+            return data["answer"]
+        
+        # Fuzzy match, only against candidates from the trigram index that ask about the same things
+        best_key = None
         best_score = 0
+        content = content_words(question)
         
-        for key, data in self._memory["questions"].items():
-            score = self._similarity(question, data["question"])
+        matcher = SequenceMatcher(None, normalized)
+        for key in self._fuzzy_candidates(normalized):
+            if self._content[key] != content:
+                continue
+            matcher.set_seq2(self._normalized[key])
+            # quick ratios are upper bounds of ratio(), so they only skip sure misses
+            if matcher.real_quick_ratio() < similarity_threshold or matcher.quick_ratio() < similarity_threshold:
+                continue
+            score = matcher.ratio()
             if score > best_score and score >= similarity_threshold:
                 best_score = score
-                best_match = data
+                best_key = key
         
-        if best_match:
-            best_match["last_used"] = datetime.now().isoformat()
-            best_match["use_count"] = best_match.get("use_count", 0) + 1
-            self._save()
+        if best_key is not None:
+            best_match = self._memory["questions"][best_key]
+            self._record_use(best_key, best_match)
             return best_match["answer"]
         
+        # Semantic match, for paraphrases
+        if self._semantic is not None:
+            if semantic_threshold is None:
+                semantic_threshold = Config.MEMORY_SEMANTIC_THRESHOLD
+            found = self._semantic.search(self._embedder.embed([question])[0],
+                                          accept=lambda key: self._content[key] == content)
+            if found and found[1] >= semantic_threshold:
+                key, score = found
+                match = self._memory["questions"][key]
+                print(f"Semantic match ({score:.2f}): '{match['question']}'")
+                self._record_use(key, match)
+                return match["answer"]
+        
         return None
     
     def store_answer(self, question: str, answer: str, field_type: str = "text"):
@@ -89,19 +258,53 @@ class ApplicationMemory:
             answer: The answer
             field_type: Type of field (text, dropdown, radio, checkbox)
         """
-        key = self._normalize_question(question).replace(" ", "_")[:50]
+        self.store_answers([{"question": question, "answer": answer, "type": field_type}])
+    
+    def store_answers(self, items: List[Dict[str, Any]]):
+        """
+        Store several question-answer pairs in one transaction.
         
-        self._memory["questions"][key] = {
-            "question": question,
-            "answer": answer,
-            "type": field_type,
-            "created": datetime.now().isoformat(),
-            "last_used": datetime.now().isoformat(),
-            "use_count": 1
-        }
+        Args:
+            items: Dicts with keys: question, answer, type (optional, default "text"),
+                   source (optional, e.g. "warmup"), resume_hash (optional)
+        """
+        now = datetime.now().isoformat()
+        entries = {}
+        for item in items:
+            key = self._normalize_question(item["question"]).replace(" ", "_")[:50]
+            entries[key] = {
+                "question": item["question"],
+                "answer": item["answer"],
+                "type": item.get("type", "text"),
+                "created": now,
+                "last_used": now,
+                "use_count": 1,
+                "source": item.get("source", "generated"),
+                "resume_hash": item.get("resume_hash")
+            }
+        if not entries:
+            return
         
-        self._save()
-        print(f"Stored: '{question}' → '{answer}'")
+        vectors = None
+        if self._semantic is not None:
+            matrix = self._embedder.embed([entry["question"] for entry in entries.values()])
+            vectors = dict(zip(entries, matrix))
+        
+        self._store.upsert(entries, self._embedder.name if vectors else None,
+                           {key: vector.tobytes() for key, vector in (vectors or {}).items()})
+        for key, entry in entries.items():
+            self._memory["questions"][key] = entry
+            self._index_entry(key, entry["question"])
+            if vectors:
+                self._semantic.add(key, vectors[key])
+        
+        for entry in entries.values():
+            print(f"Stored: '{entry['question']}' → '{entry['answer']}'")
+    
+    def get_entry(self, question: str) -> Optional[Dict[str, Any]]:
+        """Stored entry for exactly this (normalized) question, without counting a use."""
+        key = self._exact.get(self._normalize_question(question))
+        return self._memory["questions"][key] if key is not None else None
     
     def get_all_answers(self) -> Dict[str, Any]:
         """Get all stored Q&A pairs."""
@@ -109,8 +312,10 @@ class ApplicationMemory:
     
     def clear(self):
         """Clear all stored answers."""
-        self._memory = {"questions": {}, "metadata": {"created": datetime.now().isoformat()}}
-        self._save()
+        with self._usage_lock:
+            self._pending_usage = {}
+        self._store.clear()
+        self._memory = self._load()
 
 
 # Factory function
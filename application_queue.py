@@ -0,0 +1,209 @@
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from database import Job, JobMinHash, Application, ApplicationQueueEntry, init_db
+from config import Config
+
+class ApplicationQueue:
+    """
+    Persistent priority queue of scored jobs waiting to be applied to.
+
+    Priority is the job's fit score plus a bonus that fades with the age of
+    the job (QUEUE_RECENCY_BOOST over QUEUE_RECENCY_DAYS) and a bonus for
+    Easy Apply jobs. pop() hands out the best job only while today's
+    application budget (MAX_APPLICATIONS_PER_DAY, counted from the
+    applications table) is not spent.
+
+    SOLID Principles:
+    - Single Responsibility: Only orders and hands out jobs to apply to
+    - Dependency Inversion: Receives its DB session via the constructor
+    """
+
+    def __init__(self, db: Session, max_per_day: Optional[int] = None):
+        """
+        Args:
+            db: Database session
+            max_per_day: Daily application budget. If None, uses Config.MAX_APPLICATIONS_PER_DAY.
+        """
+        self.db = db
+        self.max_per_day = Config.MAX_APPLICATIONS_PER_DAY if max_per_day is None else max_per_day
+        self._requeue_interrupted()
+
+    def _requeue_interrupted(self):
+        """Put jobs left in_progress by an interrupted run back in the queue."""
+        interrupted = self.db.query(ApplicationQueueEntry).filter_by(status="in_progress")
+        if interrupted.update({"status": "queued"}):
+            self.db.commit()
+
+    def push(self, job: Job, easy_apply: Optional[bool] = None) -> bool:
+        """
+        Queue a scored job (or update its score if already queued).
+
+        Returns:
+            bool: False if the job was not queued (unscored, a near-duplicate,
+                  already applied or handled)
+        """
+        if job.fit_score is None or job.status != "found":
+            return False
+        fingerprint = self.db.get(JobMinHash, job.id)
+        if fingerprint is not None and fingerprint.duplicate_of_id is not None:
+            return False
+
+        entry = self.db.query(ApplicationQueueEntry).filter_by(job_id=job.id).first()
+        if entry is None:
+            entry = ApplicationQueueEntry(job_id=job.id, status="queued")
+            self.db.add(entry)
+        elif entry.status != "queued":
+            return False
+
+        entry.score = job.fit_score
+        if easy_apply is not None:
+            entry.easy_apply = easy_apply
+        entry.updated_at = datetime.utcnow()
+        self.db.commit()
+        return True
+
+    def push_scored(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Queue the jobs from the analyze step whose analysis says to apply.
+        
+        Near-duplicates (analysis has "duplicate_of") are skipped; their
+        original is queued instead.
+
+        Args:
+            jobs: Job dicts with "id" (platform_job_id), "analysis" and optional "easy_apply"
+
+        Returns:
+            int: Number of jobs queued
+        """
+        queued = 0
+        for job_data in jobs:
+            analysis = job_data.get("analysis", {})
+            if not analysis.get("should_apply") or analysis.get("duplicate_of"):
+                continue
+            job = self.db.query(Job).filter_by(platform_job_id=str(job_data["id"])).first()
+            if job is not None and self.push(job, job_data.get("easy_apply")):
+                queued += 1
+        return queued
+
+    def _priority(self):
+        """SQL expression for an entry's priority (higher is better)."""
+        age_days = func.julianday("now") - func.julianday(Job.created_at)
+        recency = func.max(0.0, 1.0 - age_days / Config.QUEUE_RECENCY_DAYS)
+        easy_apply = case((ApplicationQueueEntry.easy_apply.is_(True), Config.QUEUE_EASY_APPLY_BOOST), else_=0.0)
+        return ApplicationQueueEntry.score + Config.QUEUE_RECENCY_BOOST * recency + easy_apply
+
+    def _ordered(self):
+        return (self.db.query(ApplicationQueueEntry)
+                .join(Job, ApplicationQueueEntry.job_id == Job.id)
+                .filter(ApplicationQueueEntry.status == "queued")
+                .order_by(self._priority().desc(), ApplicationQueueEntry.enqueued_at))
+
+    def applied_today(self) -> int:
+        """Applications recorded since local midnight."""
+        midnight = datetime.now().astimezone().replace(hour=0, minute=0, second=0, microsecond=0)
+        # applied_at is stored as naive UTC
+        since = midnight.astimezone(timezone.utc).replace(tzinfo=None)
+        return self.db.query(Application).filter(Application.applied_at >= since).count()
+
+    def remaining_today(self) -> int:
+        """Applications left in today's budget."""
+        return max(0, self.max_per_day - self.applied_today())
+
+    def pop(self, exclude: Optional[Iterable[int]] = None) -> Optional[Job]:
+        """
+        Take the highest-priority job, or None if the queue is empty or the budget is spent.
+
+        The job stays in_progress until complete(), discard() or release() is called.
+
+        Args:
+            exclude: Job ids not to hand out, e.g. the ones already tried in this run
+                     (a re-queued failure is retried in a later run, not immediately)
+        """
+        if self.remaining_today() <= 0:
+            return None
+
+        query = self._ordered()
+        if exclude:
+            query = query.filter(ApplicationQueueEntry.job_id.notin_(list(exclude)))
+        entry = query.first()
+        if entry is None:
+            return None
+
+        entry.status = "in_progress"
+        entry.attempts = (entry.attempts or 0) + 1
+        entry.updated_at = datetime.utcnow()
+        self.db.commit()
+        return entry.job
+
+    def complete(self, job: Job, submitted: bool, cover_letter: Optional[str] = None,
+                 resume_version: Optional[str] = None):
+        """
+        Record the outcome of a popped job.
+
+        A submitted application is written to the applications table (and so
+        counts against today's budget), and the job's near-duplicates are
+        marked applied too. A failed one is re-queued until it has had
+        QUEUE_MAX_ATTEMPTS attempts.
+        """
+        entry = self.db.query(ApplicationQueueEntry).filter_by(job_id=job.id).first()
+
+        if submitted:
+            self.db.add(Application(
+                job_id=job.id,
+                resume_version=resume_version,
+                cover_letter_content=cover_letter
+            ))
+            job.status = "applied"
+            status = "done"
+            self._mark_duplicates_applied(job)
+        else:
+            attempts = entry.attempts if entry else 0
+            status = "queued" if attempts < Config.QUEUE_MAX_ATTEMPTS else "failed"
+
+        if entry is not None:
+            entry.status = status
+            entry.updated_at = datetime.utcnow()
+        self.db.commit()
+
+    def _mark_duplicates_applied(self, job: Job):
+        duplicates = (self.db.query(Job)
+                      .join(JobMinHash, JobMinHash.job_id == Job.id)
+                      .filter(JobMinHash.duplicate_of_id == job.id))
+        for duplicate in duplicates:
+            duplicate.status = "applied"
+            entry = self.db.query(ApplicationQueueEntry).filter_by(job_id=duplicate.id, status="queued").first()
+            if entry is not None:
+                entry.status = "done"
+                entry.updated_at = datetime.utcnow()
+
+    def release(self, job: Job):
+        """Put a popped job back without counting the attempt (the failure was not the job's)."""
+        entry = self.db.query(ApplicationQueueEntry).filter_by(job_id=job.id).first()
+        if entry is not None:
+            entry.status = "queued"
+            entry.attempts = max(0, (entry.attempts or 1) - 1)
+            entry.updated_at = datetime.utcnow()
+            self.db.commit()
+
+    def discard(self, job: Job):
+        """Drop a popped job without retrying it (e.g. no Easy Apply)."""
+        entry = self.db.query(ApplicationQueueEntry).filter_by(job_id=job.id).first()
+        if entry is not None:
+            entry.status = "failed"
+            entry.updated_at = datetime.utcnow()
+            self.db.commit()
+
+    def peek(self, limit: int = 10) -> List[Job]:
+        """Next jobs in priority order, without taking them."""
+        return [entry.job for entry in self._ordered().limit(limit)]
+
+    def __len__(self) -> int:
+        return self.db.query(ApplicationQueueEntry).filter_by(status="queued").count()
+
+
+# Factory function
+def create_application_queue(db: Optional[Session] = None) -> ApplicationQueue:
+    """Factory function to create ApplicationQueue with default dependencies."""
+    return ApplicationQueue(db or init_db())
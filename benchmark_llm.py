@@ -0,0 +1,153 @@
+"""
+Offline throughput benchmark for the LLM pipeline.
+
+Runs JobAnalyzer and FormFiller against a ReplayProvider, so no API keys
+are needed and results are reproducible. Replays a recorded cassette if
+one exists (LLM_MODE=record captures one from a live run).
+
+Ends by running the default pipeline (scoring service, form filler) in
+replay mode and checking that it left data/ untouched.
+
+Usage:
+    python benchmark_llm.py --jobs 50 --latency 0.5 --failure-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Must be set before Config is imported: replay mode moves persisted paths out of data/
+os.environ["LLM_MODE"] = "replay"
+
+from llm_offline_providers import ReplayProvider
+from llm_service import LLMService
+from usage_tracker import UsageTracker
+from job_analyzer import JobAnalyzer, ResumeLoader
+from application_memory import ApplicationMemory
+from form_filler import FormFiller
+from config import Config
+
+SAMPLE_TITLES = [
+    "Machine Learning Engineer", "Backend Engineer", "Data Scientist",
+    "Senior Python Developer", "Staff Nurse", "DevOps Engineer"
+]
+
+SAMPLE_FIELDS = [
+    {"label": "How many years of Python experience do you have?", "type": "text"},
+    {"label": "Are you authorized to work in the US?", "type": "radio", "options": ["Yes", "No"]},
+    {"label": "What is your highest level of education?", "type": "dropdown",
+     "options": ["High School", "Bachelor's", "Master's", "PhD"]},
+]
+
+
+def make_jobs(count: int):
+    return [
+        {
+            "id": str(1000 + i),
+            "title": SAMPLE_TITLES[i % len(SAMPLE_TITLES)],
+            "company": f"Company {i}",
+            "description": "Python, AWS, Docker, distributed systems."
+        }
+        for i in range(count)
+    ]
+
+
+def report(name: str, count: int, elapsed: float):
+    print(f"{name:<28} {count:>4} items  {elapsed:7.2f}s  {count / elapsed if elapsed else 0:8.1f}/s")
+
+
+def snapshot(directory: Path):
+    """(size, mtime) of every file under directory."""
+    return {
+        path: (path.stat().st_size, path.stat().st_mtime_ns)
+        for path in directory.rglob("*") if path.is_file()
+    }
+
+
+def check_replay_isolation(jobs):
+    """Run the default factories in replay mode; fail if anything under data/ changed."""
+    from job_scoring import create_job_scoring_service
+    from form_filler import create_form_filler
+
+    before = snapshot(Config.DATA_DIR)
+    create_job_scoring_service().score_many(jobs)
+    filler = create_form_filler()
+    filler.get_answers(SAMPLE_FIELDS)
+    filler._memory.flush()
+    after = snapshot(Config.DATA_DIR)
+
+    changed = sorted(str(path) for path in set(before) | set(after) if before.get(path) != after.get(path))
+    if changed:
+        raise RuntimeError(f"Replay run modified real data: {', '.join(changed)}")
+    print(f"data/ unchanged ({len(after)} files); replay data went to {Config.REPLAY_SCRATCH_DIR}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=Config.JOB_SCORING_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=Config.LLM_MOCK_LATENCY)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=Config.LLM_MOCK_FAILURE_RATE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    provider = ReplayProvider(Config.LLM_CASSETTE_PATH, latency=args.latency,
+                              latency_jitter=args.jitter, failure_rate=args.failure_rate,
+                              seed=args.seed)
+    usage = UsageTracker()
+    llm = LLMService([provider], usage_tracker=usage)
+
+    workdir = Path(tempfile.mkdtemp(prefix="llm-bench-"))
+    resume_path = workdir / "resume.txt"
+    resume_path.write_text(Config.RESUME_PATH.read_text() if Config.RESUME_PATH.exists()
+                           else "Skills: Python, AWS, Docker\nExperience: 3 years")
+    resume_loader = ResumeLoader(resume_path)
+
+    analyzer = JobAnalyzer(llm, resume_loader)
+    jobs = make_jobs(args.jobs)
+
+    print("\n--- Benchmark ---")
+    start = time.perf_counter()
+    for job in jobs:
+        analyzer.analyze(job)
+    report("JobAnalyzer.analyze", len(jobs), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    analyzer.analyze_many(jobs, batch_size=args.batch_size)
+    report(f"analyze_many (batch={args.batch_size})", len(jobs), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    asyncio.run(analyzer.aanalyze_many(jobs, max_concurrency=args.concurrency))
+    report(f"aanalyze_many (conc={args.concurrency})", len(jobs), time.perf_counter() - start)
+
+    memory = ApplicationMemory(workdir / "memory.json")
+    filler = FormFiller(llm, memory, resume_loader)
+    start = time.perf_counter()
+    for field in SAMPLE_FIELDS:
+        filler.get_answer(field)
+    report("FormFiller.get_answer", len(SAMPLE_FIELDS), time.perf_counter() - start)
+    memory.close()
+
+    memory = ApplicationMemory(workdir / "memory-batch.db")
+    filler = FormFiller(llm, memory, resume_loader)
+    start = time.perf_counter()
+    filler.get_answers(SAMPLE_FIELDS)
+    report("FormFiller.get_answers", len(SAMPLE_FIELDS), time.perf_counter() - start)
+    memory.close()
+
+    print("\n--- Provider ---")
+    print(provider.stats)
+    print("\n--- Usage by caller ---")
+    for caller, totals in usage.totals("caller").items():
+        print(f"{caller}: {totals}")
+
+    print("\n--- Replay isolation ---")
+    check_replay_isolation(jobs[:5])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,116 @@
 import asyncio
 import os
 import json
-import random
 from pathlib import Path
+from typing import Optional
 from playwright.async_api import async_playwright
 from config import Config
+from wait_strategy import WaitStrategy, WaitTimings, PacingPolicy
+from request_policy import RequestPolicy
+
+# Runs in the page over all .job-card-container elements; returns plain JSON
+_JOB_CARDS_SCRIPT = """
+cards => {
+    const first = (card, selectors) => {
+        for (const selector of selectors) {
+            const el = card.querySelector(selector);
+            if (el) return el;
+        }
+        return null;
+    };
+    const text = el => el ? el.innerText.trim().replace(/\\n/g, " ") : "Unknown";
+    return cards.map(card => {
+        const link = first(card, ["a.job-card-container__link", "a.job-card-list__title"]);
+        const location = first(card, [".artdeco-entity-lockup__caption",
+                                       ".job-card-container__metadata-item"]);
+        const footer = Array.from(card.querySelectorAll(
+            ".job-card-container__footer-item, .job-card-container__apply-method"));
+        return {
+            id: card.getAttribute("data-job-id"),
+            title: text(first(card, ["a.job-card-container__link strong", ".job-card-list__title strong"])),
+            company: text(first(card, [".artdeco-entity-lockup__subtitle",
+                                       ".job-card-container__primary-description"])),
+            link: (link && link.getAttribute("href")) || "",
+            location: location ? location.innerText.trim().replace(/\\n/g, " ") : null,
+            easy_apply: footer.some(el => /easy apply/i.test(el.innerText))
+        };
+    });
+}
+"""
+
+# Runs in the page; walks a form container and returns a serializable field schema.
+# Locators prefer the element id, then its name, then its position in the container.
+_FORM_SCHEMA_SCRIPT = """
+root => {
+    const modal = document.querySelector(root);
+    if (!modal) return [];
+    const clean = text => (text || "").replace(/\\s+/g, " ").trim();
+    const locator = el => {
+        if (el.id) return `#${CSS.escape(el.id)}`;
+        const tag = el.tagName.toLowerCase();
+        if (el.name && el.type !== "radio") {
+            const byName = `${root} ${tag}[name="${CSS.escape(el.name)}"]`;
+            if (document.querySelectorAll(byName).length === 1) return byName;
+        }
+        const path = [];
+        for (let node = el; node && node !== modal; node = node.parentElement) {
+            const index = Array.from(node.parentElement.children)
+                .filter(sibling => sibling.tagName === node.tagName).indexOf(node) + 1;
+            path.unshift(`${node.tagName.toLowerCase()}:nth-of-type(${index})`);
+        }
+        return `${root} > ${path.join(" > ")}`;
+    };
+    const labelOf = el => {
+        const label = (el.id && modal.querySelector(`label[for="${CSS.escape(el.id)}"]`))
+            || el.closest("label");
+        const text = clean(label && label.innerText)
+            || clean(el.getAttribute("aria-label"))
+            || clean(el.previousElementSibling && el.previousElementSibling.innerText);
+        return text || "Unknown";
+    };
+    const required = el => el.required || el.getAttribute("aria-required") === "true";
+    const textTypes = ["", "text", "email", "tel", "number", "url", "search"];
+
+    const fields = [];
+    const radioGroups = {};
+    for (const el of modal.querySelectorAll("input, textarea, select")) {
+        const type = (el.getAttribute("type") || "").toLowerCase();
+        if (el.tagName === "SELECT") {
+            fields.push({
+                type: "dropdown", label: labelOf(el), locator: locator(el), required: required(el),
+                options: Array.from(el.options).map(opt => clean(opt.innerText)).filter(Boolean)
+            });
+        } else if (el.tagName === "TEXTAREA") {
+            fields.push({type: "textarea", label: labelOf(el), locator: locator(el),
+                         options: [], required: required(el)});
+        } else if (type === "radio") {
+            let group = radioGroups[el.name];
+            if (!group) {
+                const legend = el.closest("fieldset") && el.closest("fieldset").querySelector("legend");
+                group = radioGroups[el.name] = {
+                    type: "radio", label: clean(legend && legend.innerText) || labelOf(el),
+                    locator: `${root} input[type="radio"][name="${CSS.escape(el.name)}"]`,
+                    options: [], option_locators: [], required: false
+                };
+                fields.push(group);
+            }
+            group.options.push(labelOf(el) === "Unknown" ? el.value : labelOf(el));
+            group.option_locators.push(locator(el));
+            group.required = group.required || required(el);
+        } else if (type === "checkbox") {
+            fields.push({type: "checkbox", label: labelOf(el), locator: locator(el),
+                         options: ["Yes", "No"], required: required(el)});
+        } else if (type === "file") {
+            fields.push({type: "file", label: labelOf(el), locator: locator(el),
+                         options: [], required: required(el)});
+        } else if (textTypes.includes(type)) {
+            fields.push({type: "text", label: labelOf(el), locator: locator(el),
+                         options: [], required: required(el)});
+        }
+    }
+    return fields;
+}
+"""
 
 class BrowserManager:
     def __init__(self):
@@ -13,12 +119,16 @@ class BrowserManager:
         self.context = None
         self.page = None
         self.cookies_path = Config.DATA_DIR / "linkedin_cookies.json"
+        self.wait_timings = WaitTimings()
+        self.waits = None
+        self.pacing = PacingPolicy()
+        self.request_policy = RequestPolicy() if Config.REQUEST_BLOCKING else None
 
     async def start(self):
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=Config.HEADLESS,
-            slow_mo=50  # Human-like speed
+            slow_mo=Config.BROWSER_SLOW_MO
         )
         
         # Load cookies if they exist
@@ -39,17 +149,39 @@ class BrowserManager:
             )
             
         self.page = await self.context.new_page()
+        if self.request_policy:
+            await self.request_policy.attach(self.context, self.page)
+        self.waits = WaitStrategy(self.page, self.wait_timings)
         print("Browser Started.")
 
+    async def _set_page_type(self, page_type: str):
+        """Tell the request policy which page's allow-list applies to the next requests."""
+        if self.request_policy:
+            await self.request_policy.set_page_type(page_type)
+
+    def is_alive(self) -> bool:
+        """Whether the browser is still connected and the page open."""
+        return bool(self.browser and self.browser.is_connected() and self.page and not self.page.is_closed())
+
+    async def save_cookies(self):
+        cookies = await self.context.cookies()
+        with open(self.cookies_path, 'w') as f:
+            json.dump(cookies, f)
+        print("Cookies saved.")
+
     async def close(self):
-        if self.context:
+        if self.context and self.is_alive():
             # Save cookies before closing
-            cookies = await self.context.cookies()
-            with open(self.cookies_path, 'w') as f:
-                json.dump(cookies, f)
-            print("Cookies saved.")
+            await self.save_cookies()
+            
+        if self.wait_timings.summary():
+            print("Time spent waiting:")
+            self.wait_timings.report()
+        if self.request_policy:
+            print("Requests:")
+            self.request_policy.stats.report()
             
-        if self.browser:
+        if self.browser and self.browser.is_connected():
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
@@ -58,18 +190,22 @@ class BrowserManager:
     async def type_human(self, selector, text):
         """Types text with random delays to mimic human behavior."""
         await self.page.focus(selector)
+        if not self.pacing.enabled:
+            await self.page.keyboard.type(text)
+            return
         for char in text:
             await self.page.keyboard.type(char)
-            # Random delay between keystrokes
-            await asyncio.sleep(random.uniform(0.05, 0.2))
+            await self.pacing.keystroke()
 
     async def login(self):
         if not self.page:
             await self.start()
             
         print("Navigating to LinkedIn...")
-        await self.page.goto("https://www.linkedin.com/login")
-        await self.page.wait_for_timeout(2000)
+        await self._set_page_type("login")
+        await self.page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
+        # Cookies either land us on the feed or leave us on the login form
+        await self.waits.visible(".global-nav__content, #username", step="login_page")
 
         # Check if already logged in (by looking for common logged-in elements)
         # Or if the URL redirected to feed
@@ -85,9 +221,9 @@ class BrowserManager:
 
         try:
             await self.type_human("#username", Config.LINKEDIN_USERNAME)
-            await self.page.wait_for_timeout(500)
+            await self.pacing.pause()
             await self.type_human("#password", Config.LINKEDIN_PASSWORD)
-            await self.page.wait_for_timeout(1000)
+            await self.pacing.pause()
             
             await self.page.click("button[type='submit']")
             print("Submitted credentials.")
@@ -95,13 +231,12 @@ class BrowserManager:
             # Wait for navigation - MANUAL INTERVENTION MIGHT BE NEEDED (2FA)
             # We give a generous timeout for the user to handle 2FA if needed
             print("Waiting for login to complete... (If 2FA is asked, please handle it in the browser window)")
-            try:
-                await self.page.wait_for_selector(".global-nav__content", state="visible", timeout=60000) # 60s timeout
+            if await self.waits.visible(".global-nav__content", step="login", timeout=60000): # 60s timeout
                 print("Login Successful!")
+                await self.save_cookies()
                 return True
-            except:
-                print("Login timed out. Did 2FA fail?")
-                return False
+            print("Login timed out. Did 2FA fail?")
+            return False
                 
         except Exception as e:
             print(f"Login failed: {e}")
@@ -110,6 +245,11 @@ class BrowserManager:
     async def search_jobs(self, query="Software Engineer", location="United States"):
         """
         Searches for jobs and returns a list of job objects.
+        
+        Each job has id, title, company, url, location (None if not shown)
+        and easy_apply (whether the card has the Easy Apply badge). The first
+        Config.SEARCH_DESCRIPTION_LIMIT jobs also get a description, read from
+        the details pane; without it a job cannot be checked for duplicates.
         """
         if not self.page:
             await self.login()
@@ -118,64 +258,76 @@ class BrowserManager:
         # Construct URL
         # We use 'f_AL=true' for Easy Apply if we want (optional, maybe later)
         url = f"https://www.linkedin.com/jobs/search/?keywords={query}&location={location}"
-        await self.page.goto(url)
-        await self.page.wait_for_timeout(3000)
+        await self._set_page_type("search")
+        await self.page.goto(url, wait_until="domcontentloaded")
+        if not await self.waits.visible(".job-card-container", step="search_results"):
+            print("No job cards found.")
+            return []
         
-        # Scroll to load a few items
+        # Scroll to load a few items; each scroll is done once the card count settles
         for _ in range(3):
             await self.page.keyboard.press("PageDown")
-            await self.page.wait_for_timeout(1000)
+            await self.waits.count_stable(".job-card-container", step="search_scroll", timeout=5000)
             
         print("Extracting job listings...")
-        # Select all job cards
-        job_cards = await self.page.query_selector_all(".job-card-container")
+        # One round trip for all cards; selector fallbacks run in the page
+        cards = await self.page.eval_on_selector_all(".job-card-container", _JOB_CARDS_SCRIPT)
         
         jobs = []
-        for card in job_cards:
-            try:
-                # Extract Title - Updated selectors for current LinkedIn
-                title_el = await card.query_selector("a.job-card-container__link strong")
-                if not title_el:
-                    title_el = await card.query_selector(".job-card-list__title strong")
-                title = await title_el.inner_text() if title_el else "Unknown"
-                
-                # Extract ID
-                job_id = await card.get_attribute("data-job-id")
-                
-                # Extract Company - Updated selector
-                company_el = await card.query_selector(".artdeco-entity-lockup__subtitle")
-                if not company_el:
-                    company_el = await card.query_selector(".job-card-container__primary-description")
-                company = await company_el.inner_text() if company_el else "Unknown"
-                
-                # Extract Link
-                link_el = await card.query_selector("a.job-card-container__link")
-                if not link_el:
-                    link_el = await card.query_selector("a.job-card-list__title")
-                link = await link_el.get_attribute("href") if link_el else ""
-                
-                if job_id:
-                    jobs.append({
-                        "id": job_id,
-                        "title": title.strip().replace("\n", " "),
-                        "company": company.strip().replace("\n", " "),
-                        "url": f"https://www.linkedin.com{link}" if link.startswith("/") else link
-                    })
-            except Exception as e:
-                # Ignore bad cards
-                print(f"Skipping card due to error: {e}")
-                continue
+        for card in cards:
+            link = card["link"]
+            if card["id"]:
+                jobs.append({
+                    "id": card["id"],
+                    "title": card["title"],
+                    "company": card["company"],
+                    "url": f"https://www.linkedin.com{link}" if link.startswith("/") else link,
+                    "location": card["location"],
+                    "easy_apply": card["easy_apply"]
+                })
                 
         print(f"Found {len(jobs)} jobs.")
+        if Config.SEARCH_FETCH_DESCRIPTIONS:
+            fetched = 0
+            for job in jobs[:Config.SEARCH_DESCRIPTION_LIMIT]:
+                description = await self._card_description(job["id"])
+                if description:
+                    job["description"] = description
+                    fetched += 1
+            print(f"Read {fetched} job descriptions.")
         return jobs
     
+    async def _card_description(self, job_id: str) -> Optional[str]:
+        """Open a job card in the search page's details pane and return its description."""
+        try:
+            await self.pacing.pause()
+            await self.page.click(f'.job-card-container[data-job-id="{job_id}"]')
+            # The pane is swapped in place; the URL's currentJobId says which job it shows
+            if not await self.waits.url_param("currentJobId", job_id, step="job_details", timeout=5000):
+                return None
+            if not await self.waits.visible(".jobs-description__content, #job-details",
+                                            step="job_description", timeout=5000):
+                return None
+            await self.waits.network_idle(step="job_description_idle", idle_ms=300, timeout=2000)
+            text = await self.waits.snapshot(".jobs-description__content, #job-details")
+            return (text or "").strip()[:Config.SEARCH_DESCRIPTION_MAX_CHARS] or None
+        except Exception as e:
+            print(f"Could not read description of job {job_id}: {e}")
+            return None
+    
     # ===== EASY APPLY AUTOMATION =====
     
     async def navigate_to_job(self, job_url: str) -> bool:
         """Navigate to a specific job page."""
         try:
-            await self.page.goto(job_url)
-            await self.page.wait_for_timeout(2000)
+            await self._set_page_type("job")
+            await self.page.goto(job_url, wait_until="domcontentloaded")
+            # The apply button (or its absence) is what the next step reads
+            await self.waits.visible(
+                ".jobs-apply-button, .jobs-unified-top-card, .job-details-jobs-unified-top-card__container--two-pane",
+                step="job_page", timeout=15000)
+            # Let the top card finish hydrating (bounded: LinkedIn keeps some requests going)
+            await self.waits.network_idle(step="job_page_idle", idle_ms=300, timeout=3000)
             return True
         except Exception as e:
             print(f"Error navigating to job: {e}")
@@ -209,12 +361,12 @@ class BrowserManager:
         """Click the Easy Apply button and wait for modal."""
         try:
             # Click button
+            await self.pacing.pause()
+            await self._set_page_type("easy_apply")
             await self.page.click("button:has-text('Easy Apply')")
-            await self.page.wait_for_timeout(2000)
             
             # Wait for modal to appear
-            modal = await self.page.wait_for_selector(".jobs-easy-apply-modal", timeout=5000)
-            if modal:
+            if await self.waits.visible(".jobs-easy-apply-modal", step="easy_apply_modal", timeout=10000):
                 print("✓ Easy Apply modal opened")
                 return True
             
@@ -224,65 +376,16 @@ class BrowserManager:
             return False
     
     async def detect_form_fields(self):
-        """Detect all form fields in the Easy Apply modal."""
-        fields = []
+        """
+        Detect all form fields in the Easy Apply modal in one round trip.
         
+        Returns:
+            List of plain dicts with keys: type (text, textarea, dropdown, radio,
+            checkbox, file), label, locator (CSS selector for fill_form_field),
+            options, required; radio fields also have option_locators
+        """
         try:
-            # Text inputs
-            text_inputs = await self.page.query_selector_all(".jobs-easy-apply-modal input[type='text'], .jobs-easy-apply-modal input[type='email'], .jobs-easy-apply-modal input[type='tel']")
-            for inp in text_inputs:
-                label_el = await inp.evaluate("el => el.closest('label') || el.previousElementSibling")
-                label = await label_el.inner_text() if label_el else "Unknown"
-                field_id = await inp.get_attribute("id")
-                
-                fields.append({
-                    "type": "text",
-                    "label": label.strip(),
-                    "id": field_id,
-                    "element": inp
-                })
-            
-            # Dropdowns
-            selects = await self.page.query_selector_all(".jobs-easy-apply-modal select")
-            for sel in selects:
-                label_el = await sel.evaluate("el => el.closest('label') || el.previousElementSibling")
-                label = await label_el.inner_text() if label_el else "Unknown"
-                
-                # Get options
-                options = await sel.query_selector_all("option")
-                option_texts = []
-                for opt in options:
-                    text = await opt.inner_text()
-                    if text.strip():
-                        option_texts.append(text.strip())
-                
-                fields.append({
-                    "type": "dropdown",
-                    "label": label.strip(),
-                    "options": option_texts,
-                    "element": sel
-                })
-            
-            # Radio buttons
-            radios = await self.page.query_selector_all(".jobs-easy-apply-modal input[type='radio']")
-            radio_groups = {}
-            for radio in radios:
-                name = await radio.get_attribute("name")
-                if name not in radio_groups:
-                    label_el = await radio.evaluate("el => el.closest('fieldset')?.querySelector('legend') || el.closest('label')")
-                    label = await label_el.inner_text() if label_el else "Unknown"
-                    radio_groups[name] = {
-                        "type": "radio",
-                        "label": label.strip(),
-                        "options": [],
-                        "name": name
-                    }
-                
-                value = await radio.get_attribute("value")
-                radio_groups[name]["options"].append(value)
-            
-            fields.extend(radio_groups.values())
-            
+            fields = await self.page.evaluate(_FORM_SCHEMA_SCRIPT, ".jobs-easy-apply-modal")
             print(f"Detected {len(fields)} form fields")
             return fields
             
@@ -291,60 +394,89 @@ class BrowserManager:
             return []
     
     async def fill_form_field(self, field, answer: str) -> bool:
-        """Fill a single form field with the given answer."""
+        """Fill a single form field (from detect_form_fields) with the given answer."""
         try:
             field_type = field.get("type")
+            locator = field["locator"]
             
-            if field_type == "text":
-                # Clear and type
-                field_id = field.get("id")
-                await self.page.fill(f"#{field_id}", answer)
+            if field_type in ("text", "textarea"):
+                await self.page.fill(locator, answer)
                 print(f"  Filled text: {field['label']} = {answer}")
                 return True
             
             elif field_type == "dropdown":
-                # Select option
-                element = field.get("element")
-                await element.select_option(label=answer)
+                await self.page.select_option(locator, label=answer)
                 print(f"  Selected: {field['label']} = {answer}")
                 return True
             
             elif field_type == "radio":
-                # Click radio button
-                name = field.get("name")
-                await self.page.click(f"input[name='{name}'][value='{answer}']")
+                options = [option.lower() for option in field["options"]]
+                if answer.strip().lower() not in options:
+                    print(f"  No radio option '{answer}' for: {field['label']}")
+                    return False
+                await self.page.check(field["option_locators"][options.index(answer.strip().lower())])
                 print(f"  Checked radio: {field['label']} = {answer}")
                 return True
             
+            elif field_type == "checkbox":
+                await self.page.set_checked(locator, answer.strip().lower() in ("yes", "true"))
+                print(f"  Set checkbox: {field['label']} = {answer}")
+                return True
+            
+            elif field_type == "file":
+                await self.page.set_input_files(locator, answer)
+                print(f"  Attached file: {field['label']} = {answer}")
+                return True
+            
             return False
         except Exception as e:
             print(f"Error filling field: {e}")
             return False
     
-    async def submit_application(self) -> bool:
-        """Submit the Easy Apply application."""
+    async def submit_application(self) -> str:
+        """
+        Click the modal's Submit (or Next/Review) button.
+        
+        Returns:
+            str: "submitted" if Submit was clicked and the modal moved on (or the
+                 modal closed), "next" if the form moved to its next step,
+                 "stuck" if it did not move (e.g. a required field is empty),
+                 "error" if there was no button or the click failed
+        """
         try:
-            # Look for Submit or Next button
+            # (selector, whether it submits the application)
             submit_selectors = [
-                "button:has-text('Submit application')",
-                "button:has-text('Submit')",
-                "button:has-text('Next')",
-                ".jobs-easy-apply-modal footer button[type='submit']"
+                ("button:has-text('Submit application')", True),
+                ("button:has-text('Submit')", True),
+                ("button:has-text('Review')", False),
+                ("button:has-text('Next')", False),
+                (".jobs-easy-apply-modal footer button[type='submit']", False)
             ]
             
-            for selector in submit_selectors:
+            for selector, submits in submit_selectors:
                 button = await self.page.query_selector(selector)
                 if button:
+                    before = await self.waits.snapshot(".jobs-easy-apply-modal")
+                    await self.pacing.pause()
                     await button.click()
-                    await self.page.wait_for_timeout(2000)
-                    print("✓ Clicked submit/next button")
-                    return True
+                    # Next step rendered, or the modal closed after submitting
+                    changed = await self.waits.changed(".jobs-easy-apply-modal", before,
+                                                       step="modal_step", timeout=10000)
+                    closed = await self.waits.snapshot(".jobs-easy-apply-modal") is None
+                    if closed or (submits and changed):
+                        print("✓ Application submitted")
+                        return "submitted"
+                    if changed:
+                        print("✓ Moved to next step")
+                        return "next"
+                    print("✗ Form did not advance (missing or invalid answers?)")
+                    return "stuck"
             
             print("✗ No submit button found")
-            return False
+            return "error"
         except Exception as e:
             print(f"Error submitting application: {e}")
-            return False
+            return "error"
 
     async def goto_linkedin(self):
         # Renamed/Deprecated logic, just calls login
@@ -0,0 +1,129 @@
+import asyncio
+import atexit
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+from browser_manager import BrowserManager
+
+T = TypeVar("T")
+
+
+class BrowserSessionError(RuntimeError):
+    """The shared browser could not be started or logged in; retrying the action will not help."""
+
+
+class BrowserSession:
+    """
+    One logged-in browser shared by every graph node for the life of the process.
+
+    Playwright objects belong to the event loop that created them, while the
+    graph nodes are sync and would otherwise each start their own loop. The
+    session therefore owns a background thread running one event loop; nodes
+    hand it coroutines with run(). Chromium is launched and logged in on the
+    first run(), restarted if it has crashed, and closed (saving cookies) on
+    close() or at interpreter exit. A failed login is remembered: later
+    run() calls raise BrowserSessionError at once instead of launching and
+    waiting on the login page again.
+
+    SOLID Principles:
+    - Single Responsibility: Only manages the browser's lifetime
+    - Dependency Inversion: BrowserManager construction is injectable
+    """
+
+    def __init__(self, manager_factory: Callable[[], BrowserManager] = BrowserManager):
+        """
+        Args:
+            manager_factory: Creates a new (not yet started) BrowserManager
+        """
+        self._factory = manager_factory
+        self._manager: Optional[BrowserManager] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+        self.login_failed = False
+        atexit.register(self.close)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="browser-session", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, action: Callable[[BrowserManager], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Run action(browser) on the session's loop and wait for its result.
+
+        If the browser crashed (before or during the action), it is restarted
+        and the action retried once.
+        
+        Raises:
+            BrowserSessionError: If the browser cannot be launched or logged in
+        """
+        future = asyncio.run_coroutine_threadsafe(self._run(action), self._ensure_loop())
+        return future.result(timeout)
+
+    async def _run(self, action: Callable[[BrowserManager], Awaitable[T]]) -> T:
+        manager = await self._ensure_manager()
+        try:
+            return await action(manager)
+        except Exception:
+            if manager.is_alive():
+                raise
+            print("Browser crashed, restarting...")
+            manager = await self._ensure_manager()
+            return await action(manager)
+
+    async def _ensure_manager(self) -> BrowserManager:
+        if self._manager is not None and self._manager.is_alive():
+            return self._manager
+
+        if self._manager is not None:
+            self.restarts += 1
+            await self._discard(self._manager)
+            self._manager = None
+
+        if self.login_failed:
+            raise BrowserSessionError("LinkedIn login failed earlier in this session")
+
+        manager = self._factory()
+        try:
+            await manager.start()
+            logged_in = await manager.login()
+        except Exception as e:
+            await self._discard(manager)
+            raise BrowserSessionError(f"Could not start the browser: {e}") from e
+        if not logged_in:
+            self.login_failed = True
+            await self._discard(manager)
+            raise BrowserSessionError("LinkedIn login failed")
+        self._manager = manager
+        return manager
+
+    async def _discard(self, manager: BrowserManager):
+        try:
+            await manager.close()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def close(self):
+        """Close the browser (saving cookies) and stop the session's loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            thread, self._thread = self._thread, None
+            self.login_failed = False
+        if loop is None:
+            return
+
+        if self._manager is not None:
+            manager, self._manager = self._manager, None
+            try:
+                asyncio.run_coroutine_threadsafe(self._discard(manager), loop).result(30)
+            except Exception as e:
+                print(f"Error closing browser session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
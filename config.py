@@ -1,4 +1,7 @@
+import atexit
 import os
+import shutil
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -20,7 +23,38 @@ class Config:
     
     # Browser Settings
     HEADLESS = os.getenv("HEADLESS", "False").lower() == "true"
-    BROWSER_TIMEOUT = 30000  # ms
+    BROWSER_TIMEOUT = 30000  # ms, default per-step wait timeout
+    BROWSER_NETWORK_IDLE_MS = 500  # No requests for this long counts as network idle
+    BROWSER_SLOW_MO = int(os.getenv("BROWSER_SLOW_MO", "0"))  # ms added to every Playwright action
+    BROWSER_PACING = os.getenv("BROWSER_PACING", "True").lower() == "true"  # Random pauses before typing/clicks
+    BROWSER_PACING_MIN = 0.3  # seconds
+    BROWSER_PACING_MAX = 1.2  # seconds
+    BROWSER_KEYSTROKE_MIN = 0.05  # seconds between typed characters (BROWSER_PACING off types at once)
+    BROWSER_KEYSTROKE_MAX = 0.2  # seconds
+    
+    # Request blocking (assets not needed to read job cards or fill forms)
+    REQUEST_BLOCKING = os.getenv("REQUEST_BLOCKING", "True").lower() == "true"  # Chromium (CDP) only
+    REQUEST_BLOCKING_DRY_RUN = os.getenv("REQUEST_BLOCKING_DRY_RUN", "False").lower() == "true"  # Count, don't block
+    REQUEST_BLOCKED_TYPES = ["image", "media", "font"]  # Playwright resource types
+    REQUEST_BLOCKED_URL_PATTERNS = [  # Wildcards (* and ?) matched against the whole request URL
+        "*linkedin.com/li/track*",
+        "*linkedin.com/sensorCollect*",
+        "*linkedin.com/collect*",
+        "*://px.ads.linkedin.com/*",
+        "*://dc.ads.linkedin.com/*",
+        "*://snap.licdn.com/*",
+        "*doubleclick.net/*",
+        "*google-analytics.com/*",
+        "*googletagmanager.com/*",
+        "*://bat.bing.com/*",
+        "*://connect.facebook.net/*",
+    ]
+    REQUEST_ALLOWED_TYPES = {  # Blocked types let through per page type
+        "login": ["image"],  # Captcha / 2FA challenges
+        "search": [],
+        "job": [],
+        "easy_apply": [],
+    }
     
     # Safety / Stealth
     MIN_DELAY = 2  # seconds
@@ -29,12 +63,115 @@ class Config:
     # LLM Settings  
     DEFAULT_LLM_MODEL = "accounts/fireworks/models/gpt-oss-20b"  # Cheapest option
     SMART_LLM_MODEL = "gpt-4o"
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # In-flight async calls per provider
+    
+    # Offline LLM (benchmarking / load tests without API keys)
+    LLM_MODE = os.getenv("LLM_MODE", "live").lower()  # live, record, replay
+    LLM_CASSETTE_PATH = DATA_DIR / "llm_cassette.jsonl"
+    LLM_MOCK_LATENCY = float(os.getenv("LLM_MOCK_LATENCY", "0.5"))  # seconds per replayed request
+    LLM_MOCK_FAILURE_RATE = float(os.getenv("LLM_MOCK_FAILURE_RATE", "0.0"))  # 0-1
+    
+    # LLM Provider Health (circuit breaker + latency-aware routing)
+    LLM_HEALTH_WINDOW = 20  # Recent calls used for the success rate
+    LLM_EWMA_ALPHA = 0.3  # Weight of the newest latency sample
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "3"))  # Consecutive failures
+    LLM_BREAKER_MIN_SUCCESS_RATE = 0.5
+    LLM_BREAKER_COOLDOWN_SECONDS = int(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "60"))
+    LLM_SLOW_PROVIDER_FACTOR = 3.0  # Demote providers this many times slower than the fastest
+    LLM_SLOW_PROVIDER_MIN_GAP = 1.0  # ...and at least this many seconds slower
+    LLM_HEALTH_STALE_SECONDS = 300  # Forget latency after this long without samples, so demoted providers get re-tried
+    
+    # LLM Request Hedging (opt-in): duplicate slow requests to the next provider
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "False").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))  # Of the primary's recent latency
+    LLM_HEDGE_MIN_SAMPLES = 5  # Below this, use LLM_HEDGE_DEFAULT_DELAY
+    LLM_HEDGE_DEFAULT_DELAY = 8.0  # seconds
+    LLM_HEDGE_MIN_DELAY = 1.0  # seconds
+    
+    # LLM Rate Limits per provider (requests / tokens per minute, 0 = unlimited)
+    LLM_RATE_LIMITS = {
+        "Fireworks AI": {
+            "rpm": int(os.getenv("FIREWORKS_RPM", "600")),
+            "tpm": int(os.getenv("FIREWORKS_TPM", "1000000")),
+        },
+        "OpenAI": {
+            "rpm": int(os.getenv("OPENAI_RPM", "500")),
+            "tpm": int(os.getenv("OPENAI_TPM", "30000")),
+        },
+    }
+    LLM_RATE_LIMIT_RETRIES = 2  # Retries on the same provider after a 429
+    LLM_RATE_LIMIT_BACKOFF = 10.0  # seconds, when the 429 has no Retry-After
+    
+    # LLM Pricing (USD per 1M tokens: input, output) for cost accounting
+    LLM_PRICING = {
+        DEFAULT_LLM_MODEL: (0.07, 0.30),
+        SMART_LLM_MODEL: (2.50, 10.00),
+    }
+    LLM_JSON_REPAIR_ATTEMPTS = 1  # Re-asks for fields that fail schema validation
+    
+    # LLM Response Cache
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_PATH = DATA_DIR / "llm_cache.db"
+    LLM_CACHE_TTL_HOURS = int(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 1 week
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    
+    # Application Q&A memory (SQLite; the old JSON file with the same name is imported once)
+    APPLICATION_MEMORY_PATH = DATA_DIR / "application_memory.db"
+    MEMORY_USAGE_FLUSH_SIZE = 20  # Pending usage-stat updates that trigger a write
+    MEMORY_USAGE_FLUSH_SECONDS = 30  # ... or seconds since the last write
+    MEMORY_SEMANTIC_ENABLED = os.getenv("MEMORY_SEMANTIC_ENABLED", "True").lower() == "true"
+    MEMORY_SEMANTIC_THRESHOLD = float(os.getenv("MEMORY_SEMANTIC_THRESHOLD", "0.75"))  # Cosine similarity
+    MEMORY_EMBEDDING_DIM = 1024
     
     # Job Application Settings
     RESUME_PATH = DATA_DIR / "resume.txt"
+    RESUME_PROFILE_PATH = RESUME_PATH.with_suffix(".profile.json")  # Compact profile, cached per resume hash
+    RESUME_PROFILE_ENABLED = os.getenv("RESUME_PROFILE_ENABLED", "True").lower() == "true"
     TARGET_ROLE = os.getenv("TARGET_ROLE", "Software Engineer")
     MIN_JOB_SCORE = int(os.getenv("MIN_JOB_SCORE", "70"))
     MAX_APPLICATIONS_PER_DAY = int(os.getenv("MAX_APPLICATIONS_PER_DAY", "10"))
+    JOB_SCORING_CONCURRENCY = int(os.getenv("JOB_SCORING_CONCURRENCY", "8"))  # Jobs scored in parallel
+    
+    # Application queue priority (score is 0-1)
+    QUEUE_RECENCY_BOOST = 0.1  # Priority bonus for a job found just now, fading to 0 ...
+    QUEUE_RECENCY_DAYS = 7  # ... over this many days
+    QUEUE_EASY_APPLY_BOOST = 0.05  # Priority bonus for jobs known to have Easy Apply
+    QUEUE_MAX_ATTEMPTS = 2  # Failed applications are retried until this many attempts
+    EASY_APPLY_MAX_STEPS = 8  # Next/Review clicks before giving up on a multi-step form
+    
+    # Job descriptions from the search page's details pane (needed for near-duplicate detection)
+    SEARCH_FETCH_DESCRIPTIONS = os.getenv("SEARCH_FETCH_DESCRIPTIONS", "True").lower() == "true"
+    SEARCH_DESCRIPTION_LIMIT = int(os.getenv("SEARCH_DESCRIPTION_LIMIT", "25"))  # Cards opened per search
+    SEARCH_DESCRIPTION_MAX_CHARS = 4000  # Longer descriptions are cut (they also go into scoring prompts)
+    
+    # Local pre-filter: score relevance before LLM scoring, and (once calibrated) drop obvious mismatches
+    PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "True").lower() == "true"  # Score and log decisions
+    PREFILTER_CUT = os.getenv("PREFILTER_CUT", "False").lower() == "true"  # Actually skip jobs below the cut
+    PREFILTER_MIN_SCORE = float(os.getenv("PREFILTER_MIN_SCORE", "0.05"))  # Cosine similarity, 0-1
+    PREFILTER_FEATURES = 2 ** 16  # Hashed feature space
+    PREFILTER_TITLE_WEIGHT = 3.0  # Weight of job title / target role terms
+    PREFILTER_LOG_PATH = DATA_DIR / "prefilter_log.jsonl"
+    
+    # Near-duplicate job detection (MinHash + LSH over title, company, description)
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "True").lower() == "true"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # Estimated Jaccard similarity
+    DEDUP_NUM_PERM = 128
+    DEDUP_BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 similarity become candidates
+    DEDUP_SHINGLE_SIZE = 5  # Characters per shingle
+    
+    # Replay mode: fabricated responses must never reach real data, so everything the
+    # pipeline persists (jobs DB, profile cache, memory, logs) goes to a throwaway directory
+    REPLAY_SCRATCH_DIR = None
+    if LLM_MODE == "replay":
+        REPLAY_SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="career-agent-replay-"))
+        DB_PATH = REPLAY_SCRATCH_DIR / DB_PATH.name
+        LLM_CACHE_PATH = REPLAY_SCRATCH_DIR / LLM_CACHE_PATH.name
+        APPLICATION_MEMORY_PATH = REPLAY_SCRATCH_DIR / APPLICATION_MEMORY_PATH.name
+        RESUME_PROFILE_PATH = REPLAY_SCRATCH_DIR / RESUME_PROFILE_PATH.name
+        PREFILTER_LOG_PATH = REPLAY_SCRATCH_DIR / PREFILTER_LOG_PATH.name
+        if not RESUME_PATH.exists():
+            RESUME_PATH = REPLAY_SCRATCH_DIR / RESUME_PATH.name  # Example resume is created here
+        atexit.register(shutil.rmtree, REPLAY_SCRATCH_DIR, True)
 
     @classmethod
     def ensure_dirs(cls):
@@ -1,7 +1,7 @@
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Iterator
 from llm_service import LLMService, create_llm_service
 from job_analyzer import ResumeLoader
-from config import Config
+from resume_profile import create_resume_loader
 
 class CoverLetterGenerator:
     """
@@ -42,12 +42,76 @@ class CoverLetterGenerator:
         
         try:
             # Use prefer_smart=True for better quality cover letters
-            cover_letter = self._llm.chat(system_prompt, user_prompt, prefer_smart=True)
+            cover_letter = self._llm.chat(system_prompt, user_prompt, prefer_smart=True,
+                                          caller="CoverLetterGenerator")
             return cover_letter.strip()
         except Exception as e:
             print(f"Error generating cover letter: {e}")
             return self._get_fallback_letter(job_title, company)
     
+    def generate_stream(self, job_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate a cover letter, yielding text as it is produced.
+        
+        Lets callers start typing the letter before generation finishes.
+        If generation fails before any text arrives, the fallback letter
+        is yielded instead; a failure mid-letter is raised.
+        
+        Args:
+            job_data: Dict with title, company, description
+        
+        Yields:
+            str: Cover letter text chunks
+        """
+        job_title = job_data.get("title", "this position")
+        company = job_data.get("company", "your company")
+        job_desc = job_data.get("description", "")
+        
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._build_user_prompt(job_title, company, job_desc)
+        
+        started = False
+        try:
+            for chunk in self._llm.stream(system_prompt, user_prompt, prefer_smart=True,
+                                          caller="CoverLetterGenerator"):
+                if not started:
+                    # Match generate(), which strips leading whitespace
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    started = True
+                yield chunk
+        except Exception as e:
+            if started:
+                raise
+            print(f"Error generating cover letter: {e}")
+            yield self._get_fallback_letter(job_title, company)
+    
+    async def agenerate_stream(self, job_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async version of generate_stream(), for use alongside the browser."""
+        job_title = job_data.get("title", "this position")
+        company = job_data.get("company", "your company")
+        job_desc = job_data.get("description", "")
+        
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._build_user_prompt(job_title, company, job_desc)
+        
+        started = False
+        try:
+            async for chunk in self._llm.astream(system_prompt, user_prompt, prefer_smart=True,
+                                                 caller="CoverLetterGenerator"):
+                if not started:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    started = True
+                yield chunk
+        except Exception as e:
+            if started:
+                raise
+            print(f"Error generating cover letter: {e}")
+            yield self._get_fallback_letter(job_title, company)
+    
     def _build_system_prompt(self) -> str:
         """Build system prompt for cover letter generation."""
         return """You are a professional cover letter writer.
@@ -62,16 +126,16 @@ Do NOT use generic phrases like "I am writing to express my interest".
 Start with a strong hook."""
     
     def _build_user_prompt(self, title: str, company: str, desc: str) -> str:
-        """Build user prompt with job and resume data."""
+        """Build user prompt with resume and job data (static resume first, for prefix caching)."""
         return f"""
-Job Title: {title}
-Company: {company}
-Job Description: {desc}
-
 Candidate Resume:
 {self._resume}
 
-Write a cover letter for this candidate applying to this job.
+Write a cover letter for this candidate applying to the job below.
+
+Job Title: {title}
+Company: {company}
+Job Description: {desc}
 """
     
     def _get_fallback_letter(self, title: str, company: str) -> str:
@@ -89,7 +153,7 @@ Best regards"""
 def create_cover_letter_generator() -> CoverLetterGenerator:
     """Factory function to create CoverLetterGenerator with default dependencies."""
     llm_service = create_llm_service()
-    resume_loader = ResumeLoader(Config.RESUME_PATH)
+    resume_loader = create_resume_loader(llm_service)
     return CoverLetterGenerator(llm_service, resume_loader)
 
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean, LargeBinary, Index
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from config import Config
 
@@ -19,6 +19,10 @@ class Job(Base):
     # Intelligence
     fit_score = Column(Float) # 0.0 to 1.0
     fit_reason = Column(Text)
+    analysis_json = Column(Text) # Full JobAnalyzer result
+    score_resume_hash = Column(String) # Resume the score was computed against
+    score_prompt_version = Column(String) # Scoring prompt the score was computed with
+    scored_at = Column(DateTime)
     
     # Status
     status = Column(String, default="found") # found, applied, rejected, interviewed, offered
@@ -55,9 +59,66 @@ class Outreach(Base):
     sent_at = Column(DateTime, default=datetime.utcnow)
     reply_received = Column(Boolean, default=False)
 
+class JobMinHash(Base):
+    __tablename__ = 'job_minhash'
+    
+    job_id = Column(Integer, ForeignKey('jobs.id'), primary_key=True)
+    signature = Column(LargeBinary) # MinHash signature (uint64 array)
+    duplicate_of_id = Column(Integer, ForeignKey('jobs.id')) # Set when the job is a near-duplicate
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class JobLSHBand(Base):
+    __tablename__ = 'job_lsh_bands'
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('jobs.id'))
+    band = Column(Integer)
+    bucket = Column(String) # Hash of the signature rows in this band
+    
+    __table_args__ = (Index('ix_job_lsh_bands_band_bucket', 'band', 'bucket'),)
+
+class ApplicationQueueEntry(Base):
+    __tablename__ = 'application_queue'
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey('jobs.id'), unique=True)
+    score = Column(Float) # fit_score at enqueue time, 0.0 to 1.0
+    easy_apply = Column(Boolean) # None if unknown
+    status = Column(String, default="queued", index=True) # queued, in_progress, done, failed
+    attempts = Column(Integer, default=0)
+    enqueued_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    job = relationship("Job")
+
+class LLMUsageRecord(Base):
+    __tablename__ = 'llm_usage'
+    
+    id = Column(Integer, primary_key=True)
+    provider = Column(String) # Fireworks AI, OpenAI
+    model = Column(String)
+    caller = Column(String) # JobAnalyzer, FormFiller, CoverLetterGenerator
+    
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cost_usd = Column(Float, default=0.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+def _add_missing_columns(engine):
+    """Add columns introduced after a table was created (create_all only creates tables)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
 def init_db():
     engine = create_engine(f"sqlite:///{Config.DB_PATH}")
     Base.metadata.create_all(engine)
+    _add_missing_columns(engine)
     return sessionmaker(bind=engine)()
 
 if __name__ == "__main__":
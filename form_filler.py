@@ -1,8 +1,38 @@
-from typing import Dict, Any, Optional
+import hashlib
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, ConfigDict, field_validator
 from llm_service import LLMService, create_llm_service
 from application_memory import ApplicationMemory, create_application_memory
 from job_analyzer import ResumeLoader
-from config import Config
+from resume_profile import create_resume_loader
+
+class FormAnswers(BaseModel):
+    """
+    Schema for a batched form-answer response.
+    
+    Lenient per answer: numbers become strings ("5" years), booleans become
+    Yes/No, and anything else that is not a string becomes None, so one odd
+    answer never fails the whole batch. FormFiller._validate_answer then
+    checks each answer against its field.
+    """
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
+    answers: Dict[str, Optional[str]]
+    
+    @field_validator("answers", mode="before")
+    @classmethod
+    def _scalar_answers(cls, answers: Any) -> Any:
+        if not isinstance(answers, dict):
+            return answers
+        cleaned = {}
+        for question_id, answer in answers.items():
+            if isinstance(answer, bool):
+                answer = "Yes" if answer else "No"
+            elif not isinstance(answer, (str, int, float)):
+                answer = None
+            cleaned[question_id] = answer
+        return cleaned
+
 
 class FormFiller:
     """
@@ -18,6 +48,11 @@ class FormFiller:
         self._memory = memory
         self._resume = resume_loader.load()
     
+    @property
+    def resume_hash(self) -> str:
+        """Hash of the resume text answers are generated from (raw resume or profile)."""
+        return hashlib.sha256(self._resume.encode("utf-8")).hexdigest()
+    
     def get_answer(self, field: Dict[str, Any]) -> Optional[str]:
         """
         Get answer for a form field.
@@ -32,7 +67,7 @@ class FormFiller:
         field_type = field.get("type", "text")
         
         # Check memory first
-        cached_answer = self._memory.get_answer(question)
+        cached_answer = self._cached_answer(field)
         if cached_answer:
             print(f"Using cached answer for: {question}")
             return cached_answer
@@ -41,19 +76,195 @@ class FormFiller:
         print(f"Generating answer for: {question}")
         answer = self._generate_answer(field)
         
-        if answer:
+        if answer and self._has_label(field):
             # Store for future use
             self._memory.store_answer(question, answer, field_type)
         
         return answer
     
-    def _generate_answer(self, field: Dict[str, Any]) -> Optional[str]:
-        """Generate answer using LLM."""
-        question = field.get("label", "")
-        field_type = field.get("type", "text")
-        options = field.get("options", [])
+    def get_answers(self, fields: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Get answers for all fields of a form with at most one LLM round trip.
+        
+        Memory hits are resolved first; every remaining field goes into a
+        single chat_json request, and the new answers are stored in one memory
+        transaction. Fields the batch answer leaves out (or answers with an
+        invalid option) fall back to get_answer()-style single requests.
+        
+        Answers belong to fields, not labels: two fields share one only when
+        label, type and options all match, and unlabelled fields ("Unknown")
+        never share, nor use or feed memory.
+        
+        Args:
+            fields: List of dicts with keys: label, type, options (for dropdown/radio)
+        
+        Returns:
+            List of answer strings (None if unable to answer), in the same order as fields
+        """
+        answers: List[Optional[str]] = [None] * len(fields)
+        first: Dict[tuple, int] = {}  # field key -> index of the first field with it
+        copies: Dict[int, int] = {}  # index -> index of the identical field it copies
+        missing: List[int] = []
+        
+        for i, field in enumerate(fields):
+            key = self._field_key(field, i)
+            if key in first:
+                copies[i] = first[key]
+                continue
+            first[key] = i
+            cached_answer = self._cached_answer(field)
+            if cached_answer:
+                print(f"Using cached answer for: {field.get('label', '')}")
+                answers[i] = cached_answer
+            else:
+                missing.append(i)
+        
+        if missing:
+            print(f"Generating answers for {len(missing)} questions")
+            generated = self._generate_answers([fields[i] for i in missing])
+            new_items = []
+            for position, i in enumerate(missing):
+                field = fields[i]
+                answer = generated.get(position)
+                if answer is None:
+                    print(f"Generating answer for: {field.get('label', '')}")
+                    answer = self._generate_answer(field)
+                answers[i] = answer
+                if answer and self._has_label(field):
+                    new_items.append({"question": field["label"], "answer": answer,
+                                      "type": field.get("type", "text"),
+                                      "resume_hash": self.resume_hash})
+            # Store for future use
+            self._memory.store_answers(new_items)
+        
+        for i, source in copies.items():
+            answers[i] = answers[source]
+        return answers
+    
+    @staticmethod
+    def _has_label(field: Dict[str, Any]) -> bool:
+        """Whether the field's label identifies its question (unlabelled fields come back as "Unknown")."""
+        label = str(field.get("label") or "").strip()
+        return bool(label) and label != "Unknown"
+    
+    def _field_key(self, field: Dict[str, Any], index: int) -> tuple:
+        """Fields with the same key get the same answer; unlabelled fields are keyed by position."""
+        if not self._has_label(field):
+            return ("#", index)
+        return (field["label"], field.get("type", "text"), tuple(field.get("options") or ()))
+    
+    def _cached_answer(self, field: Dict[str, Any]) -> Optional[str]:
+        """Remembered answer for the field's label, if it is valid for this field's options."""
+        if not self._has_label(field):
+            return None
+        return self._validate_answer(field, self._memory.get_answer(field["label"]))
+    
+    def warm_up(self, fields: List[Dict[str, Any]], force: bool = False) -> int:
+        """
+        Pre-answer common questions from the resume in one batched LLM request.
+        
+        Answers are stored with source "warmup" and the current resume hash.
+        A question is skipped if memory already has an answer for it, unless
+        that answer came from an earlier warm-up against a different resume
+        (or force is set). Answers from real applications are never replaced.
+        
+        Args:
+            fields: Catalog of fields (label, type, options)
+            force: Re-answer every warm-up question
         
-        system_prompt = """You are an expert at filling job application forms.
+        Returns:
+            int: Number of answers stored
+        """
+        resume_hash = self.resume_hash
+        todo = []
+        for field in fields:
+            entry = self._memory.get_entry(field.get("label", ""))
+            if entry is None:
+                todo.append(field)
+            elif entry.get("source") == "warmup" and (force or entry.get("resume_hash") != resume_hash):
+                todo.append(field)
+        
+        if not todo:
+            print("Application memory is warm, nothing to do")
+            return 0
+        
+        print(f"Warming up {len(todo)} of {len(fields)} questions")
+        generated = self._generate_answers(todo)
+        # Keep every answer that validated; the rest are answered on demand later
+        items = [
+            {"question": field["label"], "answer": generated[i],
+             "type": field.get("type", "text"), "source": "warmup", "resume_hash": resume_hash}
+            for i, field in enumerate(todo) if i in generated
+        ]
+        skipped = [field["label"] for i, field in enumerate(todo) if i not in generated]
+        if skipped:
+            print(f"No valid answer for {len(skipped)} questions: {', '.join(skipped)}")
+        self._memory.store_answers(items)
+        return len(items)
+    
+    def _generate_answers(self, fields: List[Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Answer several fields in one LLM request.
+        
+        Returns:
+            index in fields -> answer, only for fields that got a valid answer
+        """
+        ids = {f"q{i + 1}": field for i, field in enumerate(fields)}
+        questions = "\n".join(
+            f"""
+{question_id}: {field.get("label", "")}
+Field Type: {field.get("type", "text")}""" + (f"\nOptions: {', '.join(field['options'])}" if field.get("options") else "")
+            for question_id, field in ids.items()
+        )
+        template = ",\n".join(f'        "{question_id}": "<answer to {question_id}>"' for question_id in ids)
+        
+        # Static resume and instructions first, so providers can reuse the cached prefix
+        user_prompt = f"""
+Resume:
+{self._resume}
+
+Answer every question below. Respond with JSON, one answer per question ID:
+{{
+    "answers": {{
+{template}
+    }}
+}}
+
+Questions:
+{questions}
+"""
+        
+        try:
+            response = self._llm.chat_json(self._build_system_prompt(), user_prompt,
+                                           caller="FormFiller", schema=FormAnswers)
+        except Exception as e:
+            print(f"Error generating answers: {e}")
+            return {}
+        
+        answers = {}
+        for i, (question_id, field) in enumerate(ids.items()):
+            answer = self._validate_answer(field, response["answers"].get(question_id))
+            if answer is not None:
+                answers[i] = answer
+        return answers
+    
+    def _validate_answer(self, field: Dict[str, Any], answer: Optional[str]) -> Optional[str]:
+        """Clean an answer; for fields with options it must be one of them."""
+        if answer is None or not str(answer).strip():
+            return None
+        answer = str(answer).strip()
+        
+        options = field.get("options") or []
+        if not options:
+            return answer
+        for option in options:
+            if option.strip().lower() == answer.lower():
+                return option
+        return None
+    
+    def _build_system_prompt(self) -> str:
+        """Build system prompt for form answers."""
+        return """You are an expert at filling job application forms.
 Given a question and the candidate's resume, provide a concise, accurate answer.
 
 Rules:
@@ -63,11 +274,22 @@ Rules:
 4. For text questions, keep answers under 100 characters
 5. For dropdown/radio, choose from provided options
 """
+    
+    def _generate_answer(self, field: Dict[str, Any]) -> Optional[str]:
+        """Generate answer using LLM (None if it is not valid for the field)."""
+        question = field.get("label", "")
+        field_type = field.get("type", "text")
+        options = field.get("options", [])
+        
+        system_prompt = self._build_system_prompt()
         
+        # Static resume and instructions first, so providers can reuse the cached prefix
         user_prompt = f"""
 Resume:
 {self._resume}
 
+Provide only the answer, no explanation.
+
 Question: {question}
 Field Type: {field_type}
 """
@@ -75,11 +297,9 @@ Field Type: {field_type}
         if options:
             user_prompt += f"Options: {', '.join(options)}\n"
         
-        user_prompt += "\nProvide only the answer, no explanation."
-        
         try:
-            answer = self._llm.chat(system_prompt, user_prompt, prefer_smart=False)
-            return answer.strip()
+            answer = self._llm.chat(system_prompt, user_prompt, prefer_smart=False, caller="FormFiller")
+            return self._validate_answer(field, answer)
         except Exception as e:
             print(f"Error generating answer: {e}")
             return None
@@ -90,7 +310,7 @@ def create_form_filler() -> FormFiller:
     """Factory function to create FormFiller with default dependencies."""
     llm_service = create_llm_service()
     memory = create_application_memory()
-    resume_loader = ResumeLoader(Config.RESUME_PATH)
+    resume_loader = create_resume_loader(llm_service)
     return FormFiller(llm_service, memory, resume_loader)
 
 
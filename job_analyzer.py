@@ -1,5 +1,14 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pathlib import Path
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import re
+import time
+import zlib
+import numpy as np
+from pydantic import BaseModel, Field, ValidationError
 from llm_service import LLMService, create_llm_service
 from config import Config
 
@@ -36,6 +45,161 @@ Target Role: Senior Machine Learning Engineer
             self._resume_content = self._resume_path.read_text().strip()
         
         return self._resume_content
+    
+    @property
+    def path(self) -> Path:
+        return self._resume_path
+    
+    def content_hash(self) -> str:
+        """SHA-256 of the raw resume text, used to detect resume edits."""
+        # Always hash the raw file, even in subclasses that override load()
+        return hashlib.sha256(ResumeLoader.load(self).encode("utf-8")).hexdigest()
+
+
+class JobAnalysis(BaseModel):
+    """Schema the LLM's job analysis must satisfy."""
+    score: int = Field(ge=0, le=100)
+    reason: str
+    matching_skills: List[str] = []
+    missing_skills: List[str] = []
+
+
+class JobPrefilter:
+    """
+    Cheap local relevance score used to drop obvious mismatches before LLM scoring.
+    
+    Each job (title, company, description) and the resume plus TARGET_ROLE are
+    turned into hashed TF-IDF vectors of word unigrams and bigrams; the score is
+    their cosine similarity (0-1). A whole batch is scored with one matrix
+    product. Title and target role words are weighted up, since search results
+    often carry little else.
+    
+    IDF comes from the resume alone (each line a document; words it never uses
+    get the highest weight), so a job's score does not depend on the rest of
+    the batch. Unless cut is set, nothing is dropped: decisions are only
+    logged, with the LLM score, until the threshold has been calibrated.
+    
+    Single Responsibility: Only computes and logs pre-filter decisions
+    """
+    
+    TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+    
+    def __init__(self, resume_loader: ResumeLoader,
+                 target_role: Optional[str] = None,
+                 min_score: Optional[float] = None,
+                 n_features: Optional[int] = None,
+                 log_path: Optional[Path] = None,
+                 cut: Optional[bool] = None):
+        """
+        Args:
+            resume_loader: Resume data loader (the raw resume text is used)
+            target_role: Role searched for. If None, uses Config.TARGET_ROLE.
+            min_score: Jobs scoring below this are cut. If None, uses Config.PREFILTER_MIN_SCORE.
+            n_features: Hash space size. If None, uses Config.PREFILTER_FEATURES.
+            log_path: JSONL file for cut decisions. If None, uses Config.PREFILTER_LOG_PATH.
+            cut: Skip jobs below min_score (else only log). If None, uses Config.PREFILTER_CUT.
+        """
+        self._resume_loader = resume_loader
+        self.target_role = target_role or Config.TARGET_ROLE
+        self.min_score = Config.PREFILTER_MIN_SCORE if min_score is None else min_score
+        self.n_features = n_features or Config.PREFILTER_FEATURES
+        self.log_path = log_path or Config.PREFILTER_LOG_PATH
+        self.cut = Config.PREFILTER_CUT if cut is None else cut
+        self._query: Optional[Dict[int, float]] = None
+        self._idf: Dict[int, float] = {}
+        self._max_idf = 1.0
+    
+    def _tokens(self, text: str) -> List[str]:
+        words = self.TOKEN_PATTERN.findall((text or "").lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    
+    def _features(self, weighted_texts: List[tuple]) -> Dict[int, float]:
+        """Hashed term counts, each text's terms scaled by its weight."""
+        counts: Dict[int, float] = {}
+        for text, weight in weighted_texts:
+            for token in self._tokens(text):
+                index = zlib.crc32(token.encode("utf-8")) % self.n_features
+                counts[index] = counts.get(index, 0.0) + weight
+        return counts
+    
+    def _query_features(self) -> Dict[int, float]:
+        if self._query is None:
+            # Always the raw resume: a compact profile drops most of the vocabulary
+            resume = ResumeLoader.load(self._resume_loader)
+            self._query = self._features([(resume, 1.0), (self.target_role, Config.PREFILTER_TITLE_WEIGHT)])
+            
+            # Fixed IDF: document frequency over the resume's lines and the target role
+            lines = [line for line in resume.splitlines() if line.strip()] + [self.target_role]
+            df: Dict[int, int] = {}
+            for line in lines:
+                for index in self._features([(line, 1.0)]):
+                    df[index] = df.get(index, 0) + 1
+            self._idf = {index: np.log((1.0 + len(lines)) / (1.0 + count)) + 1.0 for index, count in df.items()}
+            self._max_idf = np.log(1.0 + len(lines)) + 1.0
+        return self._query
+    
+    def score(self, jobs: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Relevance of each job to the resume and target role.
+        
+        Returns:
+            Array of cosine similarities in [0, 1], one per job
+        """
+        if not jobs:
+            return np.zeros(0)
+        
+        # Row 0 is the query
+        docs = [self._query_features()] + [
+            self._features([
+                (job.get("title", ""), Config.PREFILTER_TITLE_WEIGHT),
+                (job.get("company", ""), 1.0),
+                (job.get("description", ""), 1.0)
+            ])
+            for job in jobs
+        ]
+        rows = np.repeat(np.arange(len(docs)), [len(doc) for doc in docs])
+        cols = np.fromiter((i for doc in docs for i in doc), dtype=np.int64, count=len(rows))
+        vals = np.fromiter((v for doc in docs for v in doc.values()), dtype=np.float64, count=len(rows))
+        
+        # Only hash buckets that occur in this batch get a column
+        used, cols = np.unique(cols, return_inverse=True)
+        tf = np.zeros((len(docs), len(used)))
+        tf[rows, cols] = 1.0 + np.log(vals)  # sublinear tf
+        
+        idf = np.array([self._idf.get(int(index), self._max_idf) for index in used])
+        tfidf = tf * idf
+        norms = np.linalg.norm(tfidf, axis=1)
+        norms[norms == 0] = 1.0
+        tfidf /= norms[:, None]
+        
+        return np.clip(tfidf[1:] @ tfidf[0], 0.0, 1.0)
+    
+    def log_decisions(self, jobs: List[Dict[str, Any]], relevance: np.ndarray,
+                      kept: np.ndarray, results: List[Dict[str, Any]]):
+        """
+        Append one line per job to the decision log.
+        
+        Kept jobs carry their LLM score, so the cut can be calibrated
+        against it later; in log-only mode every job is kept, and
+        would_keep records what the cut would have done.
+        """
+        timestamp = datetime.utcnow().isoformat()
+        try:
+            with open(self.log_path, 'a') as f:
+                for job, value, keep, result in zip(jobs, relevance, kept, results):
+                    f.write(json.dumps({
+                        "timestamp": timestamp,
+                        "job_id": job.get("id"),
+                        "title": job.get("title"),
+                        "company": job.get("company"),
+                        "prefilter_score": round(float(value), 4),
+                        "min_score": self.min_score,
+                        "would_keep": bool(value >= self.min_score),
+                        "kept": bool(keep),
+                        "llm_score": result.get("score") if keep else None
+                    }) + "\n")
+        except OSError as e:
+            print(f"Could not write pre-filter log: {e}")
 
 
 class JobAnalyzer:
@@ -48,18 +212,35 @@ class JobAnalyzer:
     - Open/Closed: Can extend scoring logic without modifying core
     """
     
-    def __init__(self, llm_service: LLMService, resume_loader: ResumeLoader):
+    # Bump when the scoring prompts change in a way that invalidates stored scores
+    PROMPT_VERSION = "1"
+    
+    def __init__(self, llm_service: LLMService, resume_loader: ResumeLoader,
+                 prefilter: Optional[JobPrefilter] = None):
         """
         Dependency Injection: Inject dependencies instead of creating them.
         
         Args:
             llm_service: LLM service for analysis
             resume_loader: Resume data loader
+            prefilter: Optional local pre-filter applied by analyze_many()
         """
         self._llm = llm_service
         self._resume_loader = resume_loader
+        self._prefilter = prefilter
         self._resume = resume_loader.load()
     
+    @property
+    def resume_hash(self) -> str:
+        """Hash of the resume text the prompts are built from (raw resume or profile)."""
+        return hashlib.sha256(self._resume.encode("utf-8")).hexdigest()
+    
+    @property
+    def prompt_version(self) -> str:
+        """PROMPT_VERSION plus a hash of the system prompt, so prompt edits are caught too."""
+        digest = hashlib.sha256(self._build_system_prompt().encode("utf-8")).hexdigest()
+        return f"{self.PROMPT_VERSION}-{digest[:12]}"
+    
     def analyze(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze a job and return scoring data.
@@ -84,13 +265,138 @@ class JobAnalyzer:
         user_prompt = self._build_user_prompt(job_title, company, job_desc)
         
         try:
-            result = self._llm.chat_json(system_prompt, user_prompt)
+            result = self._llm.chat_json(system_prompt, user_prompt, caller="JobAnalyzer",
+                                         schema=JobAnalysis)
+            result["should_apply"] = result["score"] >= Config.MIN_JOB_SCORE
+            return result
+        except Exception as e:
+            print(f"Error analyzing job: {e}")
+            return self._get_default_result(str(e))
+    
+    async def aanalyze(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of analyze()."""
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._build_user_prompt(
+            job_data.get("title", "Unknown"),
+            job_data.get("company", "Unknown"),
+            job_data.get("description", "No description available")
+        )
+        
+        try:
+            result = await self._llm.achat_json(system_prompt, user_prompt, caller="JobAnalyzer",
+                                                schema=JobAnalysis)
             result["should_apply"] = result["score"] >= Config.MIN_JOB_SCORE
             return result
         except Exception as e:
             print(f"Error analyzing job: {e}")
             return self._get_default_result(str(e))
     
+    def analyze_many(self, jobs: List[Dict[str, Any]], batch_size: int = 5) -> List[Dict[str, Any]]:
+        """
+        Analyze several jobs, packing batch_size postings into each LLM request.
+        
+        The resume is sent once per batch instead of once per job. Entries that
+        come back missing or malformed are re-scored one at a time with analyze().
+        With a pre-filter, jobs below its cut are not sent to the LLM at all.
+        
+        Args:
+            jobs: List of job dicts (same keys as analyze(), plus optional "id")
+            batch_size: Number of jobs per LLM request
+        
+        Returns:
+            List of analysis dicts, in the same order as jobs
+        """
+        if self._prefilter is None or not jobs:
+            return self._analyze_batches(jobs, batch_size)
+        
+        relevance, kept = self._run_prefilter(jobs)
+        scored = self._analyze_batches([job for job, keep in zip(jobs, kept) if keep], batch_size)
+        return self._merge_prefiltered(jobs, relevance, kept, scored)
+    
+    async def aanalyze_many(self, jobs: List[Dict[str, Any]],
+                            max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Analyze several jobs concurrently, one LLM request per job.
+        
+        A job whose request fails gets the default low-score result (with an
+        "error" key) without affecting the others. Every LLM-scored result
+        carries its "latency" in seconds.
+        
+        Args:
+            jobs: List of job dicts (same keys as analyze(), plus optional "id")
+            max_concurrency: Requests in flight at once. If None, uses
+                      Config.JOB_SCORING_CONCURRENCY.
+        
+        Returns:
+            List of analysis dicts, in the same order as jobs
+        """
+        limit = asyncio.Semaphore(max_concurrency or Config.JOB_SCORING_CONCURRENCY)
+        
+        async def timed(job: Dict[str, Any]) -> Dict[str, Any]:
+            async with limit:
+                start = time.perf_counter()
+                result = await self.aanalyze(job)
+                result["latency"] = round(time.perf_counter() - start, 3)
+                return result
+        
+        if self._prefilter is None or not jobs:
+            return list(await asyncio.gather(*[timed(job) for job in jobs]))
+        
+        relevance, kept = self._run_prefilter(jobs)
+        scored = await asyncio.gather(*[timed(job) for job, keep in zip(jobs, kept) if keep])
+        return self._merge_prefiltered(jobs, relevance, kept, list(scored))
+    
+    def _run_prefilter(self, jobs: List[Dict[str, Any]]) -> tuple:
+        """Pre-filter relevance of each job and which ones go on to the LLM."""
+        relevance = self._prefilter.score(jobs)
+        kept = relevance >= self._prefilter.min_score
+        if not self._prefilter.cut:
+            print(f"Pre-filter (log only): {int(kept.sum())}/{len(jobs)} jobs would be kept")
+            return relevance, np.ones(len(jobs), dtype=bool)
+        print(f"Pre-filter: {int(kept.sum())}/{len(jobs)} jobs kept for LLM scoring")
+        return relevance, kept
+    
+    def _merge_prefiltered(self, jobs: List[Dict[str, Any]], relevance: np.ndarray,
+                           kept: np.ndarray, scored: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Combine LLM results for kept jobs with pre-filter results for the rest, and log."""
+        results: List[Dict[str, Any]] = [self._get_prefiltered_result(value) for value in relevance]
+        for i, result in zip(np.flatnonzero(kept), scored):
+            results[i] = result
+        
+        self._prefilter.log_decisions(jobs, relevance, kept, results)
+        return results
+    
+    def _analyze_batches(self, jobs: List[Dict[str, Any]], batch_size: int) -> List[Dict[str, Any]]:
+        """Score jobs with the LLM, batch_size postings per request."""
+        batch_size = max(1, batch_size)
+        results: List[Dict[str, Any]] = []
+        
+        for start in range(0, len(jobs), batch_size):
+            batch = jobs[start:start + batch_size]
+            ids = [self._batch_job_id(job, start + i) for i, job in enumerate(batch)]
+            
+            scored = {}
+            if len(batch) > 1:
+                try:
+                    response = self._llm.chat_json(
+                        self._build_system_prompt(),
+                        self._build_batch_user_prompt(list(zip(ids, batch))),
+                        caller="JobAnalyzer"
+                    )
+                    scored = self._index_batch_response(response)
+                except Exception as e:
+                    print(f"Error analyzing batch: {e}")
+            
+            for job_id, job in zip(ids, batch):
+                result = self._validate_result(scored.get(job_id))
+                if result is None:
+                    if len(batch) > 1:
+                        print(f"Re-scoring job {job_id} individually")
+                    result = self.analyze(job)
+                results.append(result)
+        
+        return results
+    
     def _build_system_prompt(self) -> str:
         """Build system prompt for job analysis."""
         return """You are an expert career advisor and job matcher.
@@ -111,25 +417,102 @@ Consider:
 """
     
     def _build_user_prompt(self, title: str, company: str, desc: str) -> str:
-        """Build user prompt with job and resume data."""
+        """
+        Build user prompt with resume and job data.
+        
+        The resume and response format come first and are identical for every
+        job, so providers can reuse the cached prompt prefix.
+        """
         return f"""
 Candidate Resume:
 {self._resume}
 
-Job Posting:
-Title: {title}
-Company: {company}
-Description: {desc}
-
-Analyze this job and respond with JSON:
+Analyze the job posting below and respond with JSON:
 {{
     "score": <0-100>,
     "reason": "<brief explanation>",
     "matching_skills": ["skill1", "skill2"],
     "missing_skills": ["skill1", "skill2"]
 }}
+
+Job Posting:
+Title: {title}
+Company: {company}
+Description: {desc}
 """
     
+    def _build_batch_user_prompt(self, jobs: List[tuple]) -> str:
+        """Build user prompt with the resume once and several job postings."""
+        postings = "\n".join(
+            f"""
+Job ID: {job_id}
+Title: {job.get("title", "Unknown")}
+Company: {job.get("company", "Unknown")}
+Description: {job.get("description", "No description available")}
+"""
+            for job_id, job in jobs
+        )
+        return f"""
+Candidate Resume:
+{self._resume}
+
+Analyze each job posting below independently and respond with a JSON array containing one entry per job:
+[
+    {{
+        "job_id": "<Job ID of the posting>",
+        "score": <0-100>,
+        "reason": "<brief explanation>",
+        "matching_skills": ["skill1", "skill2"],
+        "missing_skills": ["skill1", "skill2"]
+    }}
+]
+
+Job Postings:
+{postings}"""
+    
+    def _batch_job_id(self, job: Dict[str, Any], index: int) -> str:
+        """ID used to match batch entries back to jobs."""
+        return str(job.get("id") or f"job-{index}")
+    
+    def _index_batch_response(self, response: Any) -> Dict[str, Any]:
+        """Map job_id -> entry for a batch response (array or {"results": [...]})."""
+        if isinstance(response, dict):
+            response = response.get("results", response.get("jobs", []))
+        if not isinstance(response, list):
+            return {}
+        
+        return {
+            str(entry["job_id"]): entry
+            for entry in response
+            if isinstance(entry, dict) and "job_id" in entry
+        }
+    
+    def _validate_result(self, entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Check a batch entry and turn it into an analyze()-style result, or None."""
+        if not isinstance(entry, dict):
+            return None
+        
+        try:
+            analysis = JobAnalysis.model_validate(entry)
+        except ValidationError:
+            return None
+        
+        return {
+            **analysis.model_dump(),
+            "should_apply": analysis.score >= Config.MIN_JOB_SCORE
+        }
+    
+    def _get_prefiltered_result(self, relevance: float) -> Dict[str, Any]:
+        """Result for a job cut by the pre-filter."""
+        return {
+            "score": 0,
+            "reason": f"Filtered out before LLM scoring (relevance {relevance:.2f})",
+            "should_apply": False,
+            "matching_skills": [],
+            "missing_skills": [],
+            "prefiltered": True
+        }
+    
     def _get_default_result(self, error_msg: str) -> Dict[str, Any]:
         """Return default low score on error."""
         return {
@@ -137,16 +520,19 @@ Analyze this job and respond with JSON:
             "reason": f"Analysis failed: {error_msg}",
             "should_apply": False,
             "matching_skills": [],
-            "missing_skills": []
+            "missing_skills": [],
+            "error": error_msg
         }
 
 
 # Factory function
 def create_job_analyzer() -> JobAnalyzer:
     """Factory function to create JobAnalyzer with default dependencies."""
+    from resume_profile import create_resume_loader  # resume_profile imports ResumeLoader from here
     llm_service = create_llm_service()
-    resume_loader = ResumeLoader(Config.RESUME_PATH)
-    return JobAnalyzer(llm_service, resume_loader)
+    resume_loader = create_resume_loader(llm_service)
+    prefilter = JobPrefilter(resume_loader) if Config.PREFILTER_ENABLED else None
+    return JobAnalyzer(llm_service, resume_loader, prefilter)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+import hashlib
+import re
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from database import Job, JobMinHash, JobLSHBand
+from config import Config
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """
+    MinHash signatures of character shingles, computed with NumPy.
+
+    Single Responsibility: Only turns text into signatures
+    """
+
+    def __init__(self, num_perm: Optional[int] = None, shingle_size: Optional[int] = None,
+                 seed: int = 1):
+        self.num_perm = num_perm or Config.DEDUP_NUM_PERM
+        self.shingle_size = shingle_size or Config.DEDUP_SHINGLE_SIZE
+        # Fixed seed: signatures are persisted and must stay comparable across runs
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=self.num_perm, dtype=np.uint64)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace."""
+        return " ".join(re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).split())
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        size = self.shingle_size
+        if len(text) <= size:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+        return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles),
+                           dtype=np.uint64, count=len(shingles))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature (num_perm uint64 values) of the normalized text."""
+        hashes = self._shingle_hashes(self.normalize(text))
+        # (a * x + b) mod p for every permutation x shingle; a, x < 2^32 so a * x fits in uint64
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+
+class JobDedupIndex:
+    """
+    Persistent MinHash/LSH index of jobs for near-duplicate detection.
+
+    Reposts, multi-city listings and recruiter copies of a posting get
+    different platform_job_ids but nearly identical title, company and
+    description. Signatures are split into bands; jobs sharing any band
+    bucket are candidates, so a lookup only touches a few rows of the
+    indexed job_lsh_bands table instead of every job.
+
+    SOLID Principles:
+    - Single Responsibility: Only indexes and matches jobs
+    - Dependency Inversion: Receives its DB session via the constructor
+    """
+
+    def __init__(self, db: Session, hasher: Optional[MinHasher] = None,
+                 bands: Optional[int] = None, threshold: Optional[float] = None):
+        """
+        Args:
+            db: Database session
+            hasher: Signature generator. If None, uses Config defaults.
+            bands: Number of LSH bands. If None, uses Config.DEDUP_BANDS.
+            threshold: Minimum estimated Jaccard similarity for a duplicate.
+                      If None, uses Config.DEDUP_THRESHOLD.
+        """
+        self.db = db
+        self.hasher = hasher or MinHasher()
+        self.bands = bands or Config.DEDUP_BANDS
+        self.threshold = Config.DEDUP_THRESHOLD if threshold is None else threshold
+        if self.hasher.num_perm % self.bands:
+            raise ValueError(f"num_perm ({self.hasher.num_perm}) must be divisible by bands ({self.bands})")
+
+    @staticmethod
+    def job_text(job_data: Dict[str, Any]) -> str:
+        """Text a job is fingerprinted on (location is left out on purpose)."""
+        return " ".join(str(job_data.get(key) or "") for key in ("title", "company", "description"))
+
+    @staticmethod
+    def has_description(job_data: Dict[str, Any]) -> bool:
+        """
+        Whether a job can be fingerprinted reliably.
+
+        Without a description only title and company are left, which
+        different postings share ("Software Engineer" at Google), so such jobs
+        are neither matched nor indexed. Search results carry one for the
+        first Config.SEARCH_DESCRIPTION_LIMIT cards (read from the details
+        pane); jobs beyond that, or with SEARCH_FETCH_DESCRIPTIONS off, are
+        not deduplicated.
+        """
+        return bool(str(job_data.get("description") or "").strip())
+
+    def signature(self, job_data: Dict[str, Any]) -> np.ndarray:
+        return self.hasher.signature(self.job_text(job_data))
+
+    def _buckets(self, signature: np.ndarray) -> List[Tuple[int, str]]:
+        return [
+            (band, hashlib.sha1(rows.tobytes()).hexdigest()[:16])
+            for band, rows in enumerate(np.split(signature, self.bands))
+        ]
+
+    def find_duplicate(self, job_data: Dict[str, Any],
+                       exclude_job_id: Optional[int] = None) -> Optional[Tuple[Job, float]]:
+        """
+        Most similar indexed job at or above the threshold.
+
+        Args:
+            job_data: Dict with title, company, description (optional)
+            exclude_job_id: Job row to ignore (the job itself, if already stored)
+
+        Returns:
+            (job, estimated similarity), or None if there is no near-duplicate
+        """
+        if not self.has_description(job_data):
+            return None
+
+        signature = self.signature(job_data)
+        matches = or_(*[
+            and_(JobLSHBand.band == band, JobLSHBand.bucket == bucket)
+            for band, bucket in self._buckets(signature)
+        ])
+        candidate_ids = {row.job_id for row in self.db.query(JobLSHBand.job_id).filter(matches).distinct()}
+        candidate_ids.discard(exclude_job_id)
+        if not candidate_ids:
+            return None
+
+        rows = self.db.query(JobMinHash).filter(JobMinHash.job_id.in_(candidate_ids)).all()
+        candidates = np.stack([np.frombuffer(row.signature, dtype=np.uint64) for row in rows])
+        similarity = (candidates == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            return None
+
+        # Point at the original posting rather than at another duplicate
+        original_id = rows[best].duplicate_of_id or rows[best].job_id
+        return self.db.get(Job, original_id), float(similarity[best])
+
+    def add(self, job: Job, job_data: Optional[Dict[str, Any]] = None,
+            duplicate_of: Optional[Job] = None):
+        """
+        Index a stored job (no-op if it is already indexed).
+
+        Args:
+            job: Job row (must have an id)
+            job_data: Job fields to fingerprint. If None, taken from the row.
+            duplicate_of: Original posting, if the job is a near-duplicate
+        """
+        if self.db.get(JobMinHash, job.id) is not None:
+            return
+
+        if job_data is None:
+            job_data = {"title": job.title, "company": job.company, "description": job.description}
+        if not self.has_description(job_data):
+            return
+        signature = self.signature(job_data)
+
+        self.db.add(JobMinHash(
+            job_id=job.id,
+            signature=signature.tobytes(),
+            duplicate_of_id=duplicate_of.id if duplicate_of else None
+        ))
+        self.db.add_all([
+            JobLSHBand(job_id=job.id, band=band, bucket=bucket)
+            for band, bucket in self._buckets(signature)
+        ])
+        self.db.commit()
+
+    def rebuild(self):
+        """Index every stored job that is not indexed yet."""
+        indexed = {row.job_id for row in self.db.query(JobMinHash.job_id)}
+        for job in self.db.query(Job).all():
+            if job.id not in indexed:
+                self.add(job)
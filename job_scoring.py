@@ -0,0 +1,192 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import Session
+from database import Job, init_db
+from job_analyzer import JobAnalyzer, create_job_analyzer
+from job_dedup import JobDedupIndex
+from config import Config
+
+class JobScoringService:
+    """
+    Scores jobs and stores the result on the jobs table.
+
+    Scores are stamped with the analyzer's resume hash and prompt version and
+    reused on later runs (looked up by platform_job_id) until either changes,
+    so daily runs only pay for new postings. Near-duplicates of an already
+    scored posting (reposts, multi-city listings, recruiter copies) reuse its
+    fit_score, fit_reason and application status instead of being sent to
+    the LLM again.
+
+    SOLID Principles:
+    - Single Responsibility: Coordinates scoring with persistence
+    - Dependency Inversion: Analyzer, DB session and index are injected
+    """
+
+    def __init__(self, analyzer: JobAnalyzer, db: Session,
+                 dedup_index: Optional[JobDedupIndex] = None):
+        """
+        Args:
+            analyzer: LLM job analyzer
+            db: Database session
+            dedup_index: Near-duplicate index (optional)
+        """
+        self._analyzer = analyzer
+        self.db = db
+        self._dedup = dedup_index
+
+    def _get_or_create_job(self, job_data: Dict[str, Any]) -> Job:
+        job = self.db.query(Job).filter_by(platform_job_id=str(job_data["id"])).first()
+        if job is None:
+            job = Job(
+                platform_job_id=str(job_data["id"]),
+                title=job_data.get("title"),
+                company=job_data.get("company"),
+                location=job_data.get("location"),
+                description=job_data.get("description"),
+                url=job_data.get("url"),
+                status="found"
+            )
+            self.db.add(job)
+            self.db.commit()
+        return job
+
+    def _is_current(self, job: Job) -> bool:
+        """Whether the job has a score computed with the current resume and prompt."""
+        return (job.fit_score is not None
+                and job.score_resume_hash == self._analyzer.resume_hash
+                and job.score_prompt_version == self._analyzer.prompt_version)
+
+    def _stored_analysis(self, job: Job) -> Dict[str, Any]:
+        """Rebuild an analyze()-style result from the stored score."""
+        analysis = json.loads(job.analysis_json) if job.analysis_json else {}
+        analysis.setdefault("score", round(job.fit_score * 100))
+        analysis.setdefault("reason", job.fit_reason or "")
+        analysis.setdefault("matching_skills", [])
+        analysis.setdefault("missing_skills", [])
+        # The threshold may have changed since the job was scored
+        analysis["should_apply"] = analysis["score"] >= Config.MIN_JOB_SCORE
+        return analysis
+
+    def _store(self, job: Job, analysis: Dict[str, Any]):
+        job.fit_score = analysis["score"] / 100
+        job.fit_reason = analysis["reason"]
+        job.analysis_json = json.dumps(analysis)
+        job.score_resume_hash = self._analyzer.resume_hash
+        job.score_prompt_version = self._analyzer.prompt_version
+        job.scored_at = datetime.utcnow()
+        self.db.commit()
+
+    def score(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score a job, reusing a stored score or a near-duplicate's when possible.
+
+        Args:
+            job_data: Dict with keys: id, title, company, description (optional)
+
+        Returns:
+            Dict: Same shape as JobAnalyzer.analyze(), plus "duplicate_of"
+                  (platform_job_id of the original) when the score was reused
+        """
+        return self.score_many([job_data])[0]
+
+    def score_many(self, jobs: List[Dict[str, Any]],
+                   max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sync wrapper around ascore_many()."""
+        return asyncio.run(self.ascore_many(jobs, max_concurrency))
+
+    async def ascore_many(self, jobs: List[Dict[str, Any]],
+                          max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Score several jobs, sending the ones without a usable score to the LLM concurrently.
+
+        Stored scores and near-duplicates are resolved first. A duplicate of
+        another job in the same call waits for that job's result instead of
+        being scored twice. Failed jobs get JobAnalyzer's default result, so
+        the rest are still returned.
+
+        Args:
+            jobs: List of job dicts (same keys as score())
+            max_concurrency: LLM requests in flight at once. If None, uses
+                      Config.JOB_SCORING_CONCURRENCY.
+
+        Returns:
+            List of analysis dicts, in the same order as jobs
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending: List[tuple] = []  # (index, job row, job data)
+        waiting: Dict[int, List[tuple]] = defaultdict(list)  # original job id -> [(index, duplicate row)]
+        no_description = 0
+
+        for i, job_data in enumerate(jobs):
+            job = self._get_or_create_job(job_data)
+            if self._is_current(job):
+                print(f"Using stored score for {job.platform_job_id}")
+                results[i] = self._stored_analysis(job)
+                continue
+
+            if self._dedup is not None and not self._dedup.has_description(job_data):
+                no_description += 1
+            elif self._dedup is not None:
+                match = self._dedup.find_duplicate(job_data, exclude_job_id=job.id)
+                original = match[0] if match else None
+                if original is not None and self._is_current(original):
+                    print(f"Near-duplicate of {original.platform_job_id} ({match[1]:.0%} similar), reusing its score")
+                    self._dedup.add(job, job_data, duplicate_of=original)
+                    results[i] = self._reuse(job, original)
+                    continue
+                if original is not None and any(original.id == row.id for _, row, _ in pending):
+                    self._dedup.add(job, job_data, duplicate_of=original)
+                    waiting[original.id].append((i, job))
+                    continue
+                self._dedup.add(job, job_data)
+
+            pending.append((i, job, job_data))
+
+        if no_description:
+            print(f"Near-duplicate check skipped for {no_description} jobs without a description")
+
+        if pending:
+            print(f"Scoring {len(pending)} of {len(jobs)} jobs with the LLM")
+            analyses = await self._analyzer.aanalyze_many([data for _, _, data in pending], max_concurrency)
+            for (i, job, _), analysis in zip(pending, analyses):
+                if "error" not in analysis and not analysis.get("prefiltered"):
+                    self._store(job, analysis)
+                results[i] = analysis
+                for j, duplicate in waiting.get(job.id, []):
+                    results[j] = (self._reuse(duplicate, job) if self._is_current(job)
+                                  else dict(analysis, duplicate_of=job.platform_job_id))
+            self._report_latency(analyses)
+
+        return results
+
+    def _report_latency(self, analyses: List[Dict[str, Any]]):
+        latencies = sorted(a["latency"] for a in analyses if "latency" in a)
+        failed = sum(1 for a in analyses if "error" in a)
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            print(f"Scored {len(latencies)} jobs ({failed} failed): "
+                  f"p50 {p50:.2f}s, max {latencies[-1]:.2f}s")
+
+    def _reuse(self, job: Job, original: Job) -> Dict[str, Any]:
+        """Copy the original's score and status onto the duplicate."""
+        analysis = self._stored_analysis(original)
+        analysis["duplicate_of"] = original.platform_job_id
+        if original.status != "found":
+            analysis["reason"] = f"{analysis['reason']} (duplicate of a job already {original.status})".strip()
+            analysis["should_apply"] = False
+
+        self._store(job, analysis)
+        job.status = original.status
+        self.db.commit()
+        return analysis
+
+
+# Factory function
+def create_job_scoring_service(db: Optional[Session] = None) -> JobScoringService:
+    """Factory function to create JobScoringService with default dependencies."""
+    db = db or init_db()
+    dedup_index = JobDedupIndex(db) if Config.DEDUP_ENABLED else None
+    return JobScoringService(create_job_analyzer(), db, dedup_index)
@@ -0,0 +1,156 @@
+import json
+import re
+from typing import Any, Dict, Optional
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def parse_json(text: str) -> Any:
+    """
+    Parse JSON from an LLM response, repairing common defects locally.
+
+    Handles markdown fences, prose before/after the JSON, trailing commas,
+    Python literals (True/False/None) and output truncated mid-object.
+
+    Raises:
+        ValueError: If no JSON value can be recovered
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    fenced = _FENCE.search(text)
+    if fenced:
+        try:
+            return json.loads(fenced.group(1))
+        except ValueError:
+            text = fenced.group(1)
+
+    candidate = _extract_balanced(text)
+    if candidate is None:
+        raise ValueError(f"No JSON found in response: {text[:100]!r}")
+
+    repaired = _TRAILING_COMMA.sub(r"\1", _replace_outside_strings(candidate))
+    return json.loads(repaired)
+
+
+def _extract_balanced(text: str):
+    """
+    Return the first balanced {...} or [...] block, closing it if truncated.
+
+    Brackets inside string literals are ignored.
+    """
+    start = next((i for i, ch in enumerate(text) if ch in "{["), None)
+    if start is None:
+        return None
+
+    stack = []
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if not stack or stack[-1] != ch:
+                return None
+            stack.pop()
+            if not stack:
+                return text[start:i + 1]
+
+    # Truncated output: close the open string and containers
+    tail = text[start:]
+    if in_string:
+        tail += '"'
+    tail = re.sub(r'[,:]\s*$', "", tail.rstrip())
+    # A dangling key without a value cannot be completed - drop it
+    # (only inside an object: in an array the last string is a value)
+    if stack and stack[-1] == "}":
+        tail = re.sub(r'([{,])\s*"[^"]*"\s*$', r"\1", tail)
+        tail = re.sub(r',\s*$', "", tail)
+    return tail + "".join(reversed(stack))
+
+
+def _replace_outside_strings(text: str) -> str:
+    """Replace Python literals with JSON ones, leaving string contents alone."""
+    out = []
+    i = 0
+    in_string = False
+    escaped = False
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            i += 1
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+            i += 1
+            continue
+
+        for literal, replacement in _PY_LITERALS.items():
+            if text.startswith(literal, i) and not (i and text[i - 1].isalnum()):
+                out.append(replacement)
+                i += len(literal)
+                break
+        else:
+            out.append(ch)
+            i += 1
+    return "".join(out)
+
+
+def coerce_types(data: Any, schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Nudge parsed JSON toward a JSON schema (e.g. Model.model_json_schema()).
+
+    Covers what Pydantic's lax mode leaves to the caller: numbers where a
+    string is expected become strings, and a single value where a list is
+    expected becomes a one-item list. Anything else (including booleans,
+    whose wording is up to the schema) is left for validation.
+    """
+    defs = schema.get("$defs", {}) if defs is None else defs
+    if "$ref" in schema:
+        schema = defs.get(schema["$ref"].split("/")[-1], {})
+
+    # Optional[X] is anyOf [X, null]
+    options = [option for option in schema.get("anyOf", []) if option.get("type") != "null"]
+    if len(options) == 1:
+        return data if data is None else coerce_types(data, options[0], defs)
+
+    kind = schema.get("type")
+    if kind == "string" and isinstance(data, (int, float)) and not isinstance(data, bool):
+        return str(data)
+    if kind == "array" and data is not None:
+        items = data if isinstance(data, list) else [data]
+        return [coerce_types(item, schema.get("items", {}), defs) for item in items]
+    if kind == "object" and isinstance(data, dict):
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties")
+        coerced = {}
+        for key, value in data.items():
+            sub_schema = properties.get(key, additional if isinstance(additional, dict) else None)
+            coerced[key] = value if sub_schema is None else coerce_types(value, sub_schema, defs)
+        return coerced
+    return data
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from config import Config
+
+class LLMCache:
+    """
+    Persistent, content-addressed cache for LLM responses.
+
+    Entries are keyed by a hash of everything that determines the response
+    (provider, model, temperature, prompts) and stored in a local SQLite file.
+    Expired entries are dropped on read; once the cache grows past
+    max_entries, the least recently used entries are evicted.
+
+    SOLID Principles:
+    - Single Responsibility: Only stores and retrieves cached responses
+    """
+
+    def __init__(self, db_path: Optional[Path] = None,
+                 ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.db_path = db_path or Config.LLM_CACHE_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.LLM_CACHE_TTL_HOURS * 3600
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: Optional[float],
+                 system_prompt: str, user_prompt: str) -> str:
+        """Build the content hash that identifies a request."""
+        payload = json.dumps(
+            [provider, model, temperature, system_prompt, user_prompt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, *keys: str) -> Optional[str]:
+        """
+        Return the first cached response among keys, or None.
+
+        Several keys can be passed when a request could have been answered
+        by any of the configured providers; it counts as a single lookup.
+        """
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if not row:
+                    continue
+
+                if now - row[1] > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    continue
+
+                self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self._hits += 1
+                return row[0]
+
+            self._misses += 1
+            return None
+
+    def put(self, key: str, response: str, provider: str = "", model: str = ""):
+        """Store a response and evict least recently used entries over the limit."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, provider, model, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, now, now)
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for this process and the current cache size."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "entries": size
+        }
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+# Factory function
+def create_llm_cache() -> Optional[LLMCache]:
+    """Factory function to create the LLM cache, or None if disabled in Config."""
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    return LLMCache()
@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from llm_provider import LLMProvider, LLMUsage
+from llm_providers import FireworksProvider, OpenAIProvider
+from config import Config
+
+def _request_key(system_prompt: str, user_prompt: str) -> str:
+    return hashlib.sha256(f"{system_prompt}\x00{user_prompt}".encode("utf-8")).hexdigest()
+
+
+class RecordingProvider(LLMProvider):
+    """
+    Wraps a real provider and appends every request/response pair to a JSONL cassette.
+
+    Keeps the wrapped provider's name and model, so routing, rate limits and
+    cache keys behave exactly as without recording.
+    """
+
+    def __init__(self, inner: LLMProvider, cassette_path: Optional[Path] = None):
+        self._inner = inner
+        self.cassette_path = cassette_path or Config.LLM_CASSETTE_PATH
+        self._lock = threading.Lock()
+
+    def _record(self, system_prompt: str, user_prompt: str, response: str, latency: float):
+        entry = {
+            "key": _request_key(system_prompt, user_prompt),
+            "provider": self._inner.get_name(),
+            "model": self._inner.get_model(),
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "response": response,
+            "latency": round(latency, 4)
+        }
+        with self._lock:
+            with open(self.cassette_path, 'a') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def chat(self, system_prompt: str, user_prompt: str) -> str:
+        return self.chat_with_usage(system_prompt, user_prompt)[0]
+
+    async def achat(self, system_prompt: str, user_prompt: str) -> str:
+        return (await self.achat_with_usage(system_prompt, user_prompt))[0]
+
+    def chat_with_usage(self, system_prompt: str, user_prompt: str,
+                        json_mode: bool = False) -> Tuple[str, LLMUsage]:
+        start = time.perf_counter()
+        response, usage = self._inner.chat_with_usage(system_prompt, user_prompt, json_mode)
+        self._record(system_prompt, user_prompt, response, time.perf_counter() - start)
+        return response, usage
+
+    async def achat_with_usage(self, system_prompt: str, user_prompt: str,
+                               json_mode: bool = False) -> Tuple[str, LLMUsage]:
+        start = time.perf_counter()
+        response, usage = await self._inner.achat_with_usage(system_prompt, user_prompt, json_mode)
+        self._record(system_prompt, user_prompt, response, time.perf_counter() - start)
+        return response, usage
+
+    def stream(self, system_prompt: str, user_prompt: str):
+        start = time.perf_counter()
+        chunks = []
+        for chunk in self._inner.stream(system_prompt, user_prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._record(system_prompt, user_prompt, "".join(chunks), time.perf_counter() - start)
+
+    async def astream(self, system_prompt: str, user_prompt: str):
+        start = time.perf_counter()
+        chunks = []
+        async for chunk in self._inner.astream(system_prompt, user_prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._record(system_prompt, user_prompt, "".join(chunks), time.perf_counter() - start)
+
+    def is_available(self) -> bool:
+        return self._inner.is_available()
+
+    def get_name(self) -> str:
+        return self._inner.get_name()
+
+    def get_model(self) -> str:
+        return self._inner.get_model()
+
+    def get_temperature(self) -> Optional[float]:
+        return self._inner.get_temperature()
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Offline provider that serves recorded responses or fabricates plausible ones.
+
+    Requests found in the cassette get their recorded response. Anything
+    else gets a deterministic fake: JSON built from the response template in
+    the prompt when JSON is requested, a short plain answer otherwise.
+    Synthetic latency and failure rates make it usable for load tests.
+    """
+
+    def __init__(self, cassette_path: Optional[Path] = None,
+                 latency: Optional[float] = None,
+                 latency_jitter: float = 0.0,
+                 failure_rate: Optional[float] = None,
+                 seed: int = 0,
+                 strict: bool = False,
+                 name: str = "Replay"):
+        """
+        Args:
+            cassette_path: JSONL written by RecordingProvider (optional)
+            latency: Seconds each request takes. If None, uses Config.LLM_MOCK_LATENCY.
+            latency_jitter: +/- seconds of uniform noise on the latency
+            failure_rate: Fraction (0-1) of requests that raise.
+                      If None, uses Config.LLM_MOCK_FAILURE_RATE.
+            seed: Seed for latency, failures and fabricated values
+            strict: If True, requests missing from the cassette raise instead of being fabricated
+            name: Provider name reported to LLMService
+        """
+        self.latency = Config.LLM_MOCK_LATENCY if latency is None else latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = Config.LLM_MOCK_FAILURE_RATE if failure_rate is None else failure_rate
+        self.strict = strict
+        self._name = name
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses: Dict[str, List[str]] = {}
+        self._served: Dict[str, int] = {}
+        self.stats = {"replayed": 0, "fabricated": 0, "failed": 0}
+
+        if cassette_path and Path(cassette_path).exists():
+            self._load(Path(cassette_path))
+
+    def _load(self, cassette_path: Path):
+        with open(cassette_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                key = entry.get("key") or _request_key(entry["system_prompt"], entry["user_prompt"])
+                self._responses.setdefault(key, []).append(entry["response"])
+        print(f"Loaded {sum(len(r) for r in self._responses.values())} recorded responses")
+
+    def _plan(self) -> Tuple[float, bool]:
+        """Draw this request's latency and whether it fails."""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(-self.latency_jitter, self.latency_jitter)
+            fails = self._rng.random() < self.failure_rate
+        return max(0.0, delay), fails
+
+    def _respond(self, system_prompt: str, user_prompt: str, fails: bool) -> str:
+        with self._lock:
+            if fails:
+                self.stats["failed"] += 1
+                raise RuntimeError(f"{self._name}: synthetic failure")
+
+            key = _request_key(system_prompt, user_prompt)
+            recorded = self._responses.get(key)
+            if recorded:
+                # Cycle through repeated recordings of the same request
+                index = self._served.get(key, 0)
+                self._served[key] = index + 1
+                self.stats["replayed"] += 1
+                return recorded[index % len(recorded)]
+
+            if self.strict:
+                raise KeyError(f"{self._name}: request not in cassette")
+            self.stats["fabricated"] += 1
+
+        return self._fabricate(system_prompt, user_prompt, key)
+
+    def chat(self, system_prompt: str, user_prompt: str) -> str:
+        delay, fails = self._plan()
+        time.sleep(delay)
+        return self._respond(system_prompt, user_prompt, fails)
+
+    async def achat(self, system_prompt: str, user_prompt: str) -> str:
+        delay, fails = self._plan()
+        await asyncio.sleep(delay)
+        return self._respond(system_prompt, user_prompt, fails)
+
+    def is_available(self) -> bool:
+        return True
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_model(self) -> str:
+        return "replay"
+
+    # ===== FABRICATION =====
+
+    def _fabricate(self, system_prompt: str, user_prompt: str, key: str) -> str:
+        """Deterministic fake response for a request missing from the cassette."""
+        rng = random.Random(f"{self._seed}:{key}")
+
+        if "JSON" not in system_prompt:
+            options = re.search(r"^Options: (.+)$", user_prompt, re.MULTILINE)
+            if options:
+                return options.group(1).split(", ")[0]
+            if re.search(r"^Field Type: number", user_prompt, re.MULTILINE):
+                return str(rng.randint(1, 10))
+            return "Mock response"
+
+        template = self._find_template(user_prompt) or self._find_template(system_prompt)
+        if template is None:
+            return "{}"
+
+        if template.startswith("[") and "{" in template:
+            # Batch prompts: one entry per job listed in the prompt
+            item_template = template[template.index("{"):template.rindex("}") + 1]
+            job_ids = re.findall(r"^Job ID: (.+)$", user_prompt, re.MULTILINE) or [None]
+            value = []
+            for job_id in job_ids:
+                entry = self._fill_template(item_template, rng)
+                if job_id is not None and isinstance(entry, dict):
+                    entry["job_id"] = job_id.strip()
+                value.append(entry)
+        else:
+            value = self._fill_template(template, rng)
+        return json.dumps(value)
+
+    def _find_template(self, prompt: str) -> Optional[str]:
+        """Last balanced {...} or [...] block that starts a line."""
+        found = None
+        for match in re.finditer(r"^[\[{]", prompt, re.MULTILINE):
+            start = match.start()
+            opening = prompt[start]
+            closing = "}" if opening == "{" else "]"
+            depth = 0
+            for end in range(start, len(prompt)):
+                if prompt[end] == opening:
+                    depth += 1
+                elif prompt[end] == closing:
+                    depth -= 1
+                    if depth == 0:
+                        found = prompt[start:end + 1]
+                        break
+        return found
+
+    def _fill_template(self, template: str, rng: random.Random) -> Any:
+        """Replace <placeholders> with values of a plausible type."""
+        text = re.sub(r"<(\d+)-(\d+)>", lambda m: str(rng.randint(int(m.group(1)), int(m.group(2)))), template)
+        text = re.sub(r"<number[^>]*>", lambda m: str(rng.randint(1, 10)), text)
+        text = re.sub(r'"<([^">]*)>"', lambda m: json.dumps(f"mock {m.group(1)}"), text)
+        text = re.sub(r"<[^>]*>", "null", text)
+        text = text.replace('"..."', '"mock"')
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {}
+
+
+# Factory function
+def create_offline_providers() -> Optional[List[LLMProvider]]:
+    """
+    Providers for Config.LLM_MODE, or None to use the live defaults.
+
+    - live: None (LLMService uses Fireworks/OpenAI)
+    - record: live providers wrapped in RecordingProvider
+    - replay: a single ReplayProvider reading Config.LLM_CASSETTE_PATH
+    """
+    mode = Config.LLM_MODE
+    if mode == "record":
+        return [RecordingProvider(p) for p in (FireworksProvider(), OpenAIProvider())]
+    if mode == "replay":
+        return [ReplayProvider(Config.LLM_CASSETTE_PATH)]
+    return None
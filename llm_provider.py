@@ -1,5 +1,25 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, AsyncIterator, Iterator, Optional, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) when the API reports none."""
+    return max(1, (len(text) + 3) // 4)
+
+
+@dataclass
+class LLMUsage:
+    """Token counts for one LLM request."""
+    prompt_tokens: int
+    completion_tokens: int
+    
+    @classmethod
+    def estimate(cls, system_prompt: str, user_prompt: str, response: str) -> "LLMUsage":
+        return cls(estimate_tokens(system_prompt) + estimate_tokens(user_prompt),
+                   estimate_tokens(response))
+
 
 class LLMProvider(ABC):
     """
@@ -12,6 +32,49 @@ class LLMProvider(ABC):
         """Send a chat request and return response."""
         pass
     
+    async def achat(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Send a chat request without blocking the event loop.
+        
+        Providers with a native async client should override this.
+        The default runs the blocking chat() in a worker thread.
+        """
+        return await asyncio.to_thread(self.chat, system_prompt, user_prompt)
+    
+    def chat_with_usage(self, system_prompt: str, user_prompt: str,
+                        json_mode: bool = False) -> Tuple[str, LLMUsage]:
+        """
+        Send a chat request and return the response with its token usage.
+        
+        Providers whose API reports usage should override this.
+        The default estimates usage from the text lengths.
+        
+        Args:
+            json_mode: Ask the API for a JSON object response if it has a native
+                      mode for it. Providers without one may ignore it.
+        """
+        response = self.chat(system_prompt, user_prompt)
+        return response, LLMUsage.estimate(system_prompt, user_prompt, response)
+    
+    async def achat_with_usage(self, system_prompt: str, user_prompt: str,
+                               json_mode: bool = False) -> Tuple[str, LLMUsage]:
+        """Async version of chat_with_usage()."""
+        response = await self.achat(system_prompt, user_prompt)
+        return response, LLMUsage.estimate(system_prompt, user_prompt, response)
+    
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """
+        Send a chat request and yield the response in chunks as they arrive.
+        
+        Providers that support streaming should override this.
+        The default yields the full chat() response as a single chunk.
+        """
+        yield self.chat(system_prompt, user_prompt)
+    
+    async def astream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        """Async version of stream(). The default yields the full achat() response."""
+        yield await self.achat(system_prompt, user_prompt)
+    
     @abstractmethod
     def is_available(self) -> bool:
         """Check if this provider is configured and available."""
@@ -21,3 +84,11 @@ class LLMProvider(ABC):
     def get_name(self) -> str:
         """Get the provider name for logging."""
         pass
+    
+    def get_model(self) -> str:
+        """Get the model identifier (used to key cached responses)."""
+        return ""
+    
+    def get_temperature(self) -> Optional[float]:
+        """Get the sampling temperature (used to key cached responses)."""
+        return None
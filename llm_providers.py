@@ -1,70 +1,118 @@
-from llm_provider import LLMProvider
+from typing import AsyncIterator, Iterator, List, Tuple
+from llm_provider import LLMProvider, LLMUsage
 from langchain_fireworks import ChatFireworks
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from config import Config
 
-class FireworksProvider(LLMProvider):
-    """Fireworks AI provider implementation."""
+class LangChainProvider(LLMProvider):
+    """
+    Shared implementation for providers backed by a LangChain chat model.
     
-    def __init__(self):
+    Subclasses only create the client; sync and async calls go through
+    the same message building so both paths stay identical.
+    """
+    
+    def __init__(self, model: str, temperature: float = 0.7):
         self._client = None
-        if Config.FIREWORKS_API_KEY:
-            try:
-                self._client = ChatFireworks(
-                    model=Config.DEFAULT_LLM_MODEL,
-                    temperature=0.7,
-                    max_tokens=2000
-                )
-            except Exception as e:
-                print(f"Failed to initialize Fireworks: {e}")
+        self._model = model
+        self._temperature = temperature
     
-    def chat(self, system_prompt: str, user_prompt: str) -> str:
+    def _build_messages(self, system_prompt: str, user_prompt: str) -> List[BaseMessage]:
         if not self._client:
-            raise RuntimeError("Fireworks client not initialized")
+            raise RuntimeError(f"{self.get_name()} client not initialized")
         
-        messages = [
+        return [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_prompt)
         ]
-        response = self._client.invoke(messages)
-        return response.content
+    
+    def _usage(self, system_prompt: str, user_prompt: str, response) -> LLMUsage:
+        """Token usage reported by the API, or an estimate if it is missing."""
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata:
+            return LLMUsage(metadata.get("input_tokens", 0), metadata.get("output_tokens", 0))
+        return LLMUsage.estimate(system_prompt, user_prompt, response.content)
+    
+    def chat(self, system_prompt: str, user_prompt: str) -> str:
+        return self.chat_with_usage(system_prompt, user_prompt)[0]
+    
+    async def achat(self, system_prompt: str, user_prompt: str) -> str:
+        return (await self.achat_with_usage(system_prompt, user_prompt))[0]
+    
+    def _runnable(self, json_mode: bool):
+        """The client, bound to the API's native JSON object mode if requested."""
+        if json_mode:
+            return self._client.bind(response_format={"type": "json_object"})
+        return self._client
+    
+    def chat_with_usage(self, system_prompt: str, user_prompt: str,
+                        json_mode: bool = False) -> Tuple[str, LLMUsage]:
+        messages = self._build_messages(system_prompt, user_prompt)
+        response = self._runnable(json_mode).invoke(messages)
+        return response.content, self._usage(system_prompt, user_prompt, response)
+    
+    async def achat_with_usage(self, system_prompt: str, user_prompt: str,
+                               json_mode: bool = False) -> Tuple[str, LLMUsage]:
+        messages = self._build_messages(system_prompt, user_prompt)
+        response = await self._runnable(json_mode).ainvoke(messages)
+        return response.content, self._usage(system_prompt, user_prompt, response)
+    
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        messages = self._build_messages(system_prompt, user_prompt)
+        for chunk in self._client.stream(messages):
+            if chunk.content:
+                yield chunk.content
+    
+    async def astream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        messages = self._build_messages(system_prompt, user_prompt)
+        async for chunk in self._client.astream(messages):
+            if chunk.content:
+                yield chunk.content
     
     def is_available(self) -> bool:
         return self._client is not None
     
+    def get_model(self) -> str:
+        return self._model
+    
+    def get_temperature(self) -> float:
+        return self._temperature
+
+
+class FireworksProvider(LangChainProvider):
+    """Fireworks AI provider implementation."""
+    
+    def __init__(self):
+        super().__init__(Config.DEFAULT_LLM_MODEL)
+        if Config.FIREWORKS_API_KEY:
+            try:
+                self._client = ChatFireworks(
+                    model=self._model,
+                    temperature=self._temperature,
+                    max_tokens=2000
+                )
+            except Exception as e:
+                print(f"Failed to initialize Fireworks: {e}")
+    
     def get_name(self) -> str:
         return "Fireworks AI"
 
 
-class OpenAIProvider(LLMProvider):
+class OpenAIProvider(LangChainProvider):
     """OpenAI provider implementation."""
     
     def __init__(self):
-        self._client = None
+        super().__init__(Config.SMART_LLM_MODEL)
         if Config.OPENAI_API_KEY:
             try:
                 self._client = ChatOpenAI(
-                    model=Config.SMART_LLM_MODEL,
-                    temperature=0.7,
+                    model=self._model,
+                    temperature=self._temperature,
                     max_tokens=2000
                 )
             except Exception as e:
                 print(f"Failed to initialize OpenAI: {e}")
     
-    def chat(self, system_prompt: str, user_prompt: str) -> str:
-        if not self._client:
-            raise RuntimeError("OpenAI client not initialized")
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_prompt)
-        ]
-        response = self._client.invoke(messages)
-        return response.content
-    
-    def is_available(self) -> bool:
-        return self._client is not None
-    
     def get_name(self) -> str:
         return "OpenAI"
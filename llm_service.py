@@ -1,7 +1,25 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Type
+import asyncio
 import json
-from llm_provider import LLMProvider
+import time
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel, ValidationError
+from llm_provider import LLMProvider, LLMUsage, estimate_tokens
 from llm_providers import FireworksProvider, OpenAIProvider
+from llm_offline_providers import create_offline_providers
+from llm_cache import LLMCache, create_llm_cache
+from json_repair import coerce_types, parse_json
+from provider_health import ProviderHealth
+from rate_limiter import create_rate_limiter, is_rate_limit_error, retry_after_seconds
+from usage_tracker import UsageTracker, create_usage_tracker
+from config import Config
+
+
+class _CircuitOpen(Exception):
+    """Raised internally when a provider's circuit breaker refuses a request."""
+
 
 class LLMService:
     """
@@ -10,6 +28,8 @@ class LLMService:
     Design Patterns:
     - Strategy: Different LLM providers can be swapped at runtime
     - Chain of Responsibility: Falls back through providers on failure
+    - Circuit Breaker: Skips providers that keep failing until a cooldown expires
+    - Token Bucket: Queues callers to stay under each provider's rate limits
     
     SOLID Principles:
     - Single Responsibility: Only handles LLM communication
@@ -17,13 +37,25 @@ class LLMService:
     - Dependency Inversion: Depends on LLMProvider abstraction, not concrete classes
     """
     
-    def __init__(self, providers: Optional[List[LLMProvider]] = None):
+    JSON_INSTRUCTION = "\n\nYou MUST respond with valid JSON only. No markdown, no explanations."
+    
+    def __init__(self, providers: Optional[List[LLMProvider]] = None,
+                 max_concurrency: Optional[int] = None,
+                 cache: Optional[LLMCache] = None,
+                 hedge: Optional[bool] = None,
+                 usage_tracker: Optional[UsageTracker] = None):
         """
         Initialize with dependency injection.
         
         Args:
             providers: List of LLM providers in order of preference.
                       If None, uses default providers.
+            max_concurrency: Max in-flight async requests per provider.
+                      If None, uses Config.LLM_MAX_CONCURRENCY.
+            cache: Optional response cache consulted before any provider call.
+            hedge: If True, send slow requests to the next provider as well.
+                      If None, uses Config.LLM_HEDGE_ENABLED.
+            usage_tracker: Optional token/cost accounting for every request.
         """
         if providers is None:
             # Default providers in order of preference
@@ -37,10 +69,96 @@ class LLMService:
                 "Please set FIREWORKS_API_KEY or OPENAI_API_KEY in .env"
             )
         
+        self._cache = cache
+        self._health = {p.get_name(): ProviderHealth() for p in self._providers}
+        self._limiters = {p.get_name(): create_rate_limiter(p.get_name()) for p in self._providers}
+        self._usage = usage_tracker
+        self._hedge = Config.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self._hedge_counts = {"fired": 0, "won": 0, "lost": 0}
+        self._hedge_lock = threading.Lock()
+        self._max_concurrency = max(1, max_concurrency or Config.LLM_MAX_CONCURRENCY)
+        # asyncio semaphores are bound to one event loop, so keep a set per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+        
         print(f"LLM Service initialized with: {[p.get_name() for p in self._providers]}")
     
+    def _ordered_providers(self, prefer_smart: bool) -> List[LLMProvider]:
+        """
+        Providers in the order they should be tried.
+        
+        Starts from the preference order (reversed for prefer_smart), drops
+        providers whose circuit is open, and moves providers that are much
+        slower than the fastest healthy one (LLM_SLOW_PROVIDER_FACTOR and
+        LLM_SLOW_PROVIDER_MIN_GAP) behind the others.
+        """
+        preferred = self._providers[::-1] if prefer_smart else self._providers
+        candidates = [p for p in preferred if self._health[p.get_name()].is_routable()]
+        
+        latencies = {p.get_name(): self._health[p.get_name()].expected_latency() for p in candidates}
+        known = [latency for latency in latencies.values() if latency is not None]
+        fastest = min(known) if known else None
+        
+        def rank(item):
+            index, provider = item
+            # Half-open providers keep their place so the probe actually runs
+            if self._health[provider.get_name()].state == ProviderHealth.HALF_OPEN:
+                return (False, index)
+            latency = latencies[provider.get_name()]
+            slow = (fastest is not None and latency is not None
+                    and latency > fastest * Config.LLM_SLOW_PROVIDER_FACTOR
+                    and latency - fastest > Config.LLM_SLOW_PROVIDER_MIN_GAP)
+            return (slow, index)
+        
+        return [p for _, p in sorted(enumerate(candidates), key=rank)]
+    
+    def _semaphore(self, provider: LLMProvider) -> asyncio.Semaphore:
+        """Get the concurrency limiter for a provider on the running loop."""
+        loop = asyncio.get_running_loop()
+        per_loop = self._semaphores.setdefault(loop, {})
+        name = provider.get_name()
+        if name not in per_loop:
+            per_loop[name] = asyncio.Semaphore(self._max_concurrency)
+        return per_loop[name]
+    
+    def _cache_key(self, provider: LLMProvider, system_prompt: str, user_prompt: str) -> str:
+        return LLMCache.make_key(provider.get_name(), provider.get_model(),
+                                 provider.get_temperature(), system_prompt, user_prompt)
+    
+    def _from_cache(self, providers: List[LLMProvider], system_prompt: str,
+                    user_prompt: str, parse: Optional[Callable[[str], Any]]) -> Tuple[bool, Any]:
+        """Look up a cached response any of the providers could have given."""
+        if not self._cache:
+            return False, None
+        
+        keys = [self._cache_key(p, system_prompt, user_prompt) for p in providers]
+        cached = self._cache.get(*keys)
+        if cached is None:
+            return False, None
+        
+        try:
+            return True, parse(cached) if parse else cached
+        except ValueError:
+            # Stale entry that no longer parses - treat as a miss
+            return False, None
+    
+    def _to_cache(self, provider: LLMProvider, system_prompt: str,
+                  user_prompt: str, response: str):
+        if self._cache:
+            self._cache.put(self._cache_key(provider, system_prompt, user_prompt),
+                            response, provider.get_name(), provider.get_model())
+    
+    def _finish(self, provider: LLMProvider, system_prompt: str, user_prompt: str,
+                response: str, use_cache: bool, parse: Optional[Callable[[str], Any]]) -> Any:
+        """Parse a fresh response and cache it only if it parsed."""
+        result = parse(response) if parse else response
+        if use_cache:
+            self._to_cache(provider, system_prompt, user_prompt, response)
+        return result
+    
     def chat(self, system_prompt: str, user_prompt: str, 
-             prefer_smart: bool = False) -> str:
+             prefer_smart: bool = False, use_cache: bool = True,
+             caller: Optional[str] = None) -> str:
         """
         Send a chat request with automatic fallback.
         
@@ -48,6 +166,8 @@ class LLMService:
             system_prompt: System instructions
             user_prompt: User query
             prefer_smart: If True, prefer more capable (expensive) models
+            use_cache: If True, serve and store responses via the cache
+            caller: Name of the calling component, for usage accounting
         
         Returns:
             str: LLM response
@@ -55,44 +175,536 @@ class LLMService:
         Raises:
             RuntimeError: If all providers fail
         """
-        providers = self._providers[::-1] if prefer_smart else self._providers
+        return self._complete(system_prompt, user_prompt, prefer_smart, use_cache, caller=caller)
+    
+    def _call(self, provider: LLMProvider, system_prompt: str, user_prompt: str,
+              caller: Optional[str] = None, json_mode: bool = False) -> str:
+        """
+        Call one provider, recording the outcome in its health state.
+        
+        Checks the circuit breaker first, so an open circuit spends no rate
+        limit budget, then waits for the provider's rate limiter. A 429 from
+        the provider pauses the limiter and retries instead of counting as a
+        failure.
+        """
+        name = provider.get_name()
+        health = self._health[name]
+        limiter = self._limiters[name]
+        reserved = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        
+        for attempt in range(Config.LLM_RATE_LIMIT_RETRIES + 1):
+            if not health.acquire():
+                raise _CircuitOpen(name)
+            limiter.acquire(reserved, name)
+            
+            start = time.perf_counter()
+            try:
+                print(f"Using {name}...")
+                response, usage = provider.chat_with_usage(system_prompt, user_prompt, json_mode)
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < Config.LLM_RATE_LIMIT_RETRIES:
+                    health.release()
+                    self._on_rate_limited(provider, e)
+                    continue
+                health.record_failure(time.perf_counter() - start)
+                raise
+            health.record_success(time.perf_counter() - start)
+            self._account(provider, caller, reserved, usage)
+            return response
+    
+    async def _acall(self, provider: LLMProvider, system_prompt: str, user_prompt: str,
+                     caller: Optional[str] = None, json_mode: bool = False) -> str:
+        """Async version of _call(), bounded by the provider's semaphore."""
+        name = provider.get_name()
+        health = self._health[name]
+        limiter = self._limiters[name]
+        reserved = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        
+        async with self._semaphore(provider):
+            for attempt in range(Config.LLM_RATE_LIMIT_RETRIES + 1):
+                if not health.acquire():
+                    raise _CircuitOpen(name)
+                try:
+                    await limiter.aacquire(reserved, name)
+                except asyncio.CancelledError:
+                    health.release()
+                    raise
+                
+                start = time.perf_counter()
+                try:
+                    print(f"Using {name}...")
+                    response, usage = await provider.achat_with_usage(system_prompt, user_prompt, json_mode)
+                except asyncio.CancelledError:
+                    health.release()
+                    raise
+                except Exception as e:
+                    if is_rate_limit_error(e) and attempt < Config.LLM_RATE_LIMIT_RETRIES:
+                        health.release()
+                        self._on_rate_limited(provider, e)
+                        continue
+                    health.record_failure(time.perf_counter() - start)
+                    raise
+                health.record_success(time.perf_counter() - start)
+                self._account(provider, caller, reserved, usage)
+                return response
+    
+    def _on_rate_limited(self, provider: LLMProvider, error: Exception):
+        seconds = retry_after_seconds(error)
+        print(f"{provider.get_name()} rate limited, backing off {seconds:.1f}s")
+        self._limiters[provider.get_name()].pause(seconds)
+    
+    def _account(self, provider: LLMProvider, caller: Optional[str], reserved: int, usage: LLMUsage):
+        """Settle the rate limiter with real usage and record tokens/cost."""
+        self._limiters[provider.get_name()].record_actual(
+            reserved, usage.prompt_tokens + usage.completion_tokens
+        )
+        if self._usage:
+            self._usage.record(provider.get_name(), provider.get_model(), caller,
+                               usage.prompt_tokens, usage.completion_tokens)
+    
+    def _complete(self, system_prompt: str, user_prompt: str, prefer_smart: bool,
+                  use_cache: bool, parse: Optional[Callable[[str], Any]] = None,
+                  caller: Optional[str] = None, json_mode: bool = False) -> Any:
+        providers = self._ordered_providers(prefer_smart)
+        
+        if use_cache:
+            hit, result = self._from_cache(providers, system_prompt, user_prompt, parse)
+            if hit:
+                return result
+        
+        if self._hedge and len(providers) > 1:
+            provider, response = self._run_sync(
+                self._ahedged(providers, system_prompt, user_prompt, caller, json_mode)
+            )
+            return self._finish(provider, system_prompt, user_prompt, response, use_cache, parse)
+        
+        last_error = None
+        for provider in providers:
+            try:
+                response = self._call(provider, system_prompt, user_prompt, caller, json_mode)
+            except _CircuitOpen:
+                continue
+            except Exception as e:
+                print(f"{provider.get_name()} failed: {e}")
+                last_error = e
+                continue
+            return self._finish(provider, system_prompt, user_prompt, response, use_cache, parse)
+        
+        raise self._all_failed(last_error)
+    
+    async def achat(self, system_prompt: str, user_prompt: str,
+                    prefer_smart: bool = False, use_cache: bool = True,
+                    caller: Optional[str] = None) -> str:
+        """
+        Async version of chat() with the same fallback order.
+        
+        Each provider allows at most max_concurrency requests in flight,
+        so callers can gather() many requests without flooding the API.
+        
+        Raises:
+            RuntimeError: If all providers fail
+        """
+        return await self._acomplete(system_prompt, user_prompt, prefer_smart, use_cache, caller=caller)
+    
+    async def _acomplete(self, system_prompt: str, user_prompt: str, prefer_smart: bool,
+                         use_cache: bool, parse: Optional[Callable[[str], Any]] = None,
+                         caller: Optional[str] = None, json_mode: bool = False) -> Any:
+        providers = self._ordered_providers(prefer_smart)
+        
+        if use_cache:
+            hit, result = self._from_cache(providers, system_prompt, user_prompt, parse)
+            if hit:
+                return result
+        
+        if self._hedge and len(providers) > 1:
+            provider, response = await self._ahedged(providers, system_prompt, user_prompt,
+                                                     caller, json_mode)
+            return self._finish(provider, system_prompt, user_prompt, response, use_cache, parse)
         
         last_error = None
         for provider in providers:
             try:
-                print(f"Using {provider.get_name()}...")
-                return provider.chat(system_prompt, user_prompt)
+                response = await self._acall(provider, system_prompt, user_prompt, caller, json_mode)
+            except _CircuitOpen:
+                continue
             except Exception as e:
                 print(f"{provider.get_name()} failed: {e}")
                 last_error = e
                 continue
+            return self._finish(provider, system_prompt, user_prompt, response, use_cache, parse)
         
-        raise RuntimeError(f"All LLM providers failed. Last error: {last_error}")
+        raise self._all_failed(last_error)
+    
+    async def _ahedged(self, providers: List[LLMProvider], system_prompt: str,
+                       user_prompt: str, caller: Optional[str] = None,
+                       json_mode: bool = False) -> Tuple[LLMProvider, str]:
+        """
+        Try providers in order, hedging a slow primary with the next provider.
+        
+        If the primary has not answered within its hedge delay, the same
+        request is also sent to the next provider. The first successful answer
+        wins and the other request is cancelled. Failures fall through to the
+        remaining providers as usual.
+        """
+        primary = providers[0]
+        remaining = list(providers[1:])
+        delay = self._hedge_delay(primary)
+        in_flight: Dict[asyncio.Task, LLMProvider] = {}
+        hedged = False
+        last_error = None
+        
+        def launch(provider: LLMProvider):
+            task = asyncio.create_task(
+                self._acall(provider, system_prompt, user_prompt, caller, json_mode)
+            )
+            in_flight[task] = provider
+        
+        launch(primary)
+        try:
+            while in_flight or remaining:
+                if not in_flight:
+                    launch(remaining.pop(0))
+                    continue
+                
+                timeout = delay if not hedged and remaining else None
+                done, _ = await asyncio.wait(in_flight, timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    print(f"{primary.get_name()} slower than {delay:.1f}s, hedging with {remaining[0].get_name()}")
+                    self._record_hedge("fired")
+                    launch(remaining.pop(0))
+                    continue
+                
+                for task in done:
+                    provider = in_flight.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if hedged:
+                            self._record_hedge("won" if provider is not primary else "lost")
+                        return provider, task.result()
+                    if not isinstance(error, _CircuitOpen):
+                        print(f"{provider.get_name()} failed: {error}")
+                        last_error = error
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+        
+        raise self._all_failed(last_error)
+    
+    def _hedge_delay(self, provider: LLMProvider) -> float:
+        """Seconds to wait for a provider before hedging."""
+        delay = self._health[provider.get_name()].latency_percentile(
+            Config.LLM_HEDGE_PERCENTILE, Config.LLM_HEDGE_MIN_SAMPLES
+        )
+        if delay is None:
+            delay = Config.LLM_HEDGE_DEFAULT_DELAY
+        return max(delay, Config.LLM_HEDGE_MIN_DELAY)
+    
+    def _record_hedge(self, outcome: str):
+        with self._hedge_lock:
+            self._hedge_counts[outcome] += 1
+    
+    def _run_sync(self, coro):
+        """
+        Run a coroutine to completion from sync code.
+        
+        Uses a private loop on a worker thread so it also works when the
+        caller is itself running inside an event loop.
+        """
+        def runner():
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(coro)
+            finally:
+                loop.close()
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(runner).result()
+    
+    def stream(self, system_prompt: str, user_prompt: str,
+               prefer_smart: bool = False, use_cache: bool = True,
+               caller: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream a chat response chunk by chunk, with automatic fallback.
+        
+        A provider that fails before yielding anything falls back to the next
+        one. Once text has been yielded, a failure is raised to the caller,
+        since the partial output cannot be taken back.
+        
+        Yields:
+            str: Response chunks in arrival order
+        
+        Raises:
+            RuntimeError: If all providers fail before the first chunk
+        """
+        providers = self._ordered_providers(prefer_smart)
+        
+        if use_cache:
+            hit, cached = self._from_cache(providers, system_prompt, user_prompt, None)
+            if hit:
+                yield cached
+                return
+        
+        reserved = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        last_error = None
+        for provider in providers:
+            health = self._health[provider.get_name()]
+            self._limiters[provider.get_name()].acquire(reserved, provider.get_name())
+            if not health.acquire():
+                continue
+            
+            chunks = []
+            start = time.perf_counter()
+            try:
+                print(f"Streaming from {provider.get_name()}...")
+                for chunk in provider.stream(system_prompt, user_prompt):
+                    chunks.append(chunk)
+                    yield chunk
+            except GeneratorExit:
+                health.release()
+                raise
+            except Exception as e:
+                health.record_failure(time.perf_counter() - start)
+                print(f"{provider.get_name()} failed: {e}")
+                if chunks:
+                    raise
+                last_error = e
+                continue
+            
+            health.record_success(time.perf_counter() - start)
+            response = "".join(chunks)
+            self._account(provider, caller, reserved,
+                          LLMUsage.estimate(system_prompt, user_prompt, response))
+            if use_cache:
+                self._to_cache(provider, system_prompt, user_prompt, response)
+            return
+        
+        raise self._all_failed(last_error)
+    
+    async def astream(self, system_prompt: str, user_prompt: str,
+                      prefer_smart: bool = False, use_cache: bool = True,
+                      caller: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Async version of stream(), bounded by the provider's semaphore.
+        
+        Yields:
+            str: Response chunks in arrival order
+        """
+        providers = self._ordered_providers(prefer_smart)
+        
+        if use_cache:
+            hit, cached = self._from_cache(providers, system_prompt, user_prompt, None)
+            if hit:
+                yield cached
+                return
+        
+        reserved = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        last_error = None
+        for provider in providers:
+            health = self._health[provider.get_name()]
+            async with self._semaphore(provider):
+                await self._limiters[provider.get_name()].aacquire(reserved, provider.get_name())
+                if not health.acquire():
+                    continue
+                
+                chunks = []
+                start = time.perf_counter()
+                try:
+                    print(f"Streaming from {provider.get_name()}...")
+                    async for chunk in provider.astream(system_prompt, user_prompt):
+                        chunks.append(chunk)
+                        yield chunk
+                except (GeneratorExit, asyncio.CancelledError):
+                    health.release()
+                    raise
+                except Exception as e:
+                    health.record_failure(time.perf_counter() - start)
+                    print(f"{provider.get_name()} failed: {e}")
+                    if chunks:
+                        raise
+                    last_error = e
+                    continue
+            
+            health.record_success(time.perf_counter() - start)
+            response = "".join(chunks)
+            self._account(provider, caller, reserved,
+                          LLMUsage.estimate(system_prompt, user_prompt, response))
+            if use_cache:
+                self._to_cache(provider, system_prompt, user_prompt, response)
+            return
+        
+        raise self._all_failed(last_error)
     
     def chat_json(self, system_prompt: str, user_prompt: str, 
-                  prefer_smart: bool = False) -> dict:
+                  prefer_smart: bool = False, use_cache: bool = True,
+                  caller: Optional[str] = None,
+                  schema: Optional[Type[BaseModel]] = None) -> dict:
         """
         Request JSON response from LLM.
         
+        The response is parsed leniently (see json_repair.parse_json). With a
+        schema, the provider's native JSON mode is used and the result is
+        validated; fields that fail validation are re-requested on their own
+        instead of repeating the whole request.
+        
+        Args:
+            schema: Optional Pydantic model the response must satisfy
+        
         Returns:
-            dict: Parsed JSON response
+            dict: Parsed JSON response (validated and coerced if schema given)
+        
+        Raises:
+            ValueError: If the response is not JSON or still fails validation
         """
-        system_prompt += "\n\nYou MUST respond with valid JSON only. No markdown, no explanations."
-        response = self.chat(system_prompt, user_prompt, prefer_smart)
+        system_prompt += self.JSON_INSTRUCTION
+        data = self._complete(system_prompt, user_prompt, prefer_smart, use_cache,
+                              self._parse_json, caller, json_mode=schema is not None)
+        if schema is None:
+            return data
         
-        # Clean markdown if present
-        if "```json" in response:
-            response = response.split("```json")[1].split("```")[0].strip()
-        elif "```" in response:
-            response = response.split("```")[1].split("```")[0].strip()
+        for _ in range(Config.LLM_JSON_REPAIR_ATTEMPTS):
+            model, repair_prompt = self._validate(schema, data, user_prompt)
+            if model is not None:
+                return model.model_dump()
+            fixed = self._complete(system_prompt, repair_prompt, prefer_smart, use_cache,
+                                   self._parse_json, caller, json_mode=True)
+            data = self._merge_repair(data, fixed)
         
-        return json.loads(response)
+        return self._validate_or_raise(schema, data)
+    
+    async def achat_json(self, system_prompt: str, user_prompt: str,
+                         prefer_smart: bool = False, use_cache: bool = True,
+                         caller: Optional[str] = None,
+                         schema: Optional[Type[BaseModel]] = None) -> dict:
+        """
+        Async version of chat_json().
+        
+        Returns:
+            dict: Parsed JSON response (validated and coerced if schema given)
+        """
+        system_prompt += self.JSON_INSTRUCTION
+        data = await self._acomplete(system_prompt, user_prompt, prefer_smart, use_cache,
+                                     self._parse_json, caller, json_mode=schema is not None)
+        if schema is None:
+            return data
+        
+        for _ in range(Config.LLM_JSON_REPAIR_ATTEMPTS):
+            model, repair_prompt = self._validate(schema, data, user_prompt)
+            if model is not None:
+                return model.model_dump()
+            fixed = await self._acomplete(system_prompt, repair_prompt, prefer_smart, use_cache,
+                                          self._parse_json, caller, json_mode=True)
+            data = self._merge_repair(data, fixed)
+        
+        return self._validate_or_raise(schema, data)
+    
+    def _validate(self, schema: Type[BaseModel], data: Any,
+                  user_prompt: str) -> Tuple[Optional[BaseModel], Optional[str]]:
+        """
+        Validate data against schema.
+        
+        Returns:
+            (model, None) if valid, otherwise (None, prompt asking only
+            for the fields that failed)
+        """
+        try:
+            return schema.model_validate(coerce_types(data, schema.model_json_schema())), None
+        except ValidationError as e:
+            errors = e.errors()
+        
+        fields = schema.model_fields
+        if not isinstance(data, dict):
+            failed = list(fields)
+        else:
+            failed = sorted({str(err["loc"][0]) for err in errors if err["loc"]} & set(fields)) or list(fields)
+        
+        print(f"Invalid fields in LLM response: {failed}, re-requesting them")
+        properties = schema.model_json_schema().get("properties", {})
+        wanted = {name: properties.get(name, {}) for name in failed}
+        problems = "\n".join(f"- {'.'.join(str(p) for p in err['loc']) or 'response'}: {err['msg']}"
+                             for err in errors)
+        
+        return None, f"""{user_prompt}
+
+Your previous answer had invalid or missing fields:
+{problems}
+
+Respond with a JSON object containing ONLY these fields, with valid values:
+{json.dumps(wanted, indent=2)}
+"""
+    
+    def _merge_repair(self, data: Any, fixed: Any) -> Any:
+        """Overlay re-requested fields on the original response."""
+        if isinstance(data, dict) and isinstance(fixed, dict):
+            return {**data, **fixed}
+        return fixed
+    
+    def _validate_or_raise(self, schema: Type[BaseModel], data: Any) -> dict:
+        try:
+            return schema.model_validate(coerce_types(data, schema.model_json_schema())).model_dump()
+        except ValidationError as e:
+            raise ValueError(f"LLM response failed {schema.__name__} validation: {e}") from e
+    
+    def _all_failed(self, last_error: Optional[Exception]) -> RuntimeError:
+        if last_error is None:
+            return RuntimeError("All LLM providers unavailable (circuit breakers open)")
+        return RuntimeError(f"All LLM providers failed. Last error: {last_error}")
+    
+    def health_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-provider circuit state, success rate and latency."""
+        return {name: health.snapshot() for name, health in self._health.items()}
+    
+    def hedge_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging counters.
+        
+        fired: hedge requests sent; won: the hedge answered first;
+        lost: the primary still answered first after the hedge was sent.
+        """
+        with self._hedge_lock:
+            counts = dict(self._hedge_counts)
+        counts["win_rate"] = counts["won"] / counts["fired"] if counts["fired"] else 0.0
+        return counts
+    
+    def usage_stats(self, by: str = "provider", persisted: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Get token and cost totals grouped by provider, caller or model.
+        
+        Args:
+            by: "provider", "caller" or "model"
+            persisted: If True, report all-time totals from the database
+                      instead of this process only
+        """
+        if not self._usage:
+            return {}
+        return self._usage.persisted_totals(by) if persisted else self._usage.totals(by)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counters (empty if caching is off)."""
+        return self._cache.stats() if self._cache else {}
+    
+    def _parse_json(self, response: str) -> Any:
+        """Parse a JSON response, repairing fences, prose, trailing commas and truncation."""
+        return parse_json(response)
 
 
 # Factory function for easy instantiation
 def create_llm_service() -> LLMService:
-    """Factory function to create LLM service with default configuration."""
-    return LLMService()
+    """
+    Factory function to create LLM service with default configuration.
+    
+    In replay mode (Config.LLM_MODE) responses are not cached and usage is
+    not persisted. Config also points every other persisted path (jobs DB,
+    resume profile, application memory) at a throwaway directory, so offline
+    runs never mix fake responses into real data.
+    """
+    providers = create_offline_providers()
+    if Config.LLM_MODE == "replay":
+        return LLMService(providers, usage_tracker=UsageTracker())
+    return LLMService(providers, cache=create_llm_cache(), usage_tracker=create_usage_tracker())
 
 
 if __name__ == "__main__":
@@ -18,9 +18,10 @@ def main():
     print("1. Job Search & Apply")
     print("2. Networking / Outreach")
     print("3. Analytics Dashboard (Streamlit)")
+    print("4. Warm Up Application Memory")
     
     try:
-        choice = input("Enter choice (1-3): ")
+        choice = input("Enter choice (1-4): ")
         if choice == "1":
             print("Starting Job Search Agent...")
             from agent_graph import app
@@ -40,6 +41,10 @@ def main():
             print("Starting Networking Agent... (Not implemented yet)")
         elif choice == "3":
             print("Run 'streamlit run dashboard.py' to view analytics.")
+        elif choice == "4":
+            from memory_warmup import warm_up_memory
+            stored = warm_up_memory()
+            print(f"Stored {stored} warm-up answers")
         else:
             print("Invalid choice.")
     except KeyboardInterrupt:
@@ -0,0 +1,185 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+class SQLiteMemoryStore:
+    """
+    Transactional SQLite storage for ApplicationMemory.
+
+    Each answer is one row, so storing an answer writes only that row.
+    Usage stats are applied as increments (use_count = use_count + n), so
+    concurrent runs sharing the file never overwrite each other's counts.
+    WAL mode lets readers proceed while another process writes; writers
+    wait on a busy timeout instead of failing.
+
+    SOLID Principles:
+    - Single Responsibility: Only persists Q&A entries
+    """
+
+    COLUMNS = ("question", "answer", "type", "created", "last_used", "use_count", "source", "resume_hash")
+
+    def __init__(self, db_path: Path, timeout: float = 30.0):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                type TEXT,
+                created TEXT,
+                last_used TEXT,
+                use_count INTEGER DEFAULT 0,
+                source TEXT,
+                resume_hash TEXT
+            )
+        """)
+        # Columns added after the first release
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(answers)")}
+        for column in ("source", "resume_hash"):
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE answers ADD COLUMN {column} TEXT")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed_externally(self) -> bool:
+        """Whether another connection committed since the last call (or load)."""
+        with self._lock:
+            version = self._read_data_version()
+            changed = version != self._data_version
+            self._data_version = version
+            return changed
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """All entries, keyed like ApplicationMemory's questions dict (in insertion order)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, {', '.join(self.COLUMNS)} FROM answers ORDER BY rowid"
+            ).fetchall()
+            self._data_version = self._read_data_version()
+        return {row[0]: dict(zip(self.COLUMNS, row[1:])) for row in rows}
+
+    def upsert(self, entries: Dict[str, Dict[str, Any]], model: Optional[str] = None,
+               vectors: Optional[Dict[str, bytes]] = None):
+        """Insert or replace several entries (and their embeddings, if given) in one transaction."""
+        with self._lock, self._conn:
+            if vectors:
+                self._write_embeddings(model, vectors)
+            # Upsert rather than REPLACE so an overwritten entry keeps its rowid (order)
+            self._conn.executemany(
+                f"INSERT INTO answers (key, {', '.join(self.COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in self.COLUMNS)}) "
+                f"ON CONFLICT(key) DO UPDATE SET "
+                f"{', '.join(f'{column} = excluded.{column}' for column in self.COLUMNS)}",
+                [(key, *(entry.get(column) for column in self.COLUMNS)) for key, entry in entries.items()]
+            )
+            self._set_metadata("last_updated", datetime.now().isoformat())
+
+    def record_usage(self, usage: Dict[str, Tuple[int, str]]):
+        """
+        Apply batched usage stats in one transaction.
+
+        Args:
+            usage: key -> (uses since last flush, last used timestamp)
+        """
+        if not usage:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE answers SET use_count = COALESCE(use_count, 0) + ?, "
+                "last_used = MAX(COALESCE(last_used, ''), ?) WHERE key = ?",
+                [(count, last_used, key) for key, (count, last_used) in usage.items()]
+            )
+
+    def load_embeddings(self, model: str) -> Dict[str, bytes]:
+        """Stored question embeddings made with model, keyed like the answers."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, vector FROM embeddings WHERE model = ?", (model,)
+            ).fetchall()
+        return dict(rows)
+
+    def upsert_embeddings(self, model: str, vectors: Dict[str, bytes]):
+        """Insert or replace several question embeddings in one transaction."""
+        if not vectors:
+            return
+        with self._lock, self._conn:
+            self._write_embeddings(model, vectors)
+
+    def _write_embeddings(self, model: str, vectors: Dict[str, bytes]):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, model, vector) VALUES (?, ?, ?)",
+            [(key, model, vector) for key, vector in vectors.items()]
+        )
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.execute("DELETE FROM embeddings")
+            self._set_metadata("created", datetime.now().isoformat())
+
+    def _set_metadata(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value))
+
+    def get_metadata(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT key, value FROM metadata").fetchall())
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        One-time import of the old JSON memory file.
+
+        Runs only if the file exists and has not been imported before;
+        existing rows win over imported ones.
+
+        Returns:
+            int: Number of entries imported
+        """
+        if not json_path.exists():
+            return 0
+
+        with self._lock, self._conn:
+            # BEGIN IMMEDIATE: two processes starting at once must not both import
+            self._conn.execute("BEGIN IMMEDIATE")
+            done = self._conn.execute(
+                "SELECT value FROM metadata WHERE key = 'imported_json'"
+            ).fetchone()
+            if done:
+                return 0
+
+            with open(json_path, 'r') as f:
+                memory = json.load(f)
+            questions = memory.get("questions", {})
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO answers (key, {', '.join(self.COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in self.COLUMNS)})",
+                [(key, *(entry.get(column) for column in self.COLUMNS)) for key, entry in questions.items()]
+            )
+            created = memory.get("metadata", {}).get("created")
+            if created:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO metadata (key, value) VALUES ('created', ?)", (created,)
+                )
+            self._set_metadata("imported_json", str(json_path))
+        return len(questions)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
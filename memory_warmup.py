@@ -0,0 +1,82 @@
+"""
+Warm ApplicationMemory with answers to common Easy Apply questions.
+
+Answers the catalog below (plus any extra questions from a JSON file) from
+the resume in one batched LLM request, so the first application of the day
+does not wait on the LLM. Re-running after a resume change refreshes the
+warm-up answers; unchanged ones are skipped.
+
+Usage:
+    python memory_warmup.py [--catalog extra_questions.json] [--force]
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from form_filler import FormFiller, create_form_filler
+
+COMMON_QUESTIONS: List[Dict[str, Any]] = [
+    {"label": "How many years of work experience do you have?", "type": "text"},
+    {"label": "How many years of Python experience do you have?", "type": "text"},
+    {"label": "How many years of SQL experience do you have?", "type": "text"},
+    {"label": "How many years of Java experience do you have?", "type": "text"},
+    {"label": "How many years of JavaScript experience do you have?", "type": "text"},
+    {"label": "How many years of AWS experience do you have?", "type": "text"},
+    {"label": "How many years of Machine Learning experience do you have?", "type": "text"},
+    {"label": "Are you authorized to work in the US?", "type": "radio", "options": ["Yes", "No"]},
+    {"label": "Will you now or in the future require sponsorship for employment visa status?",
+     "type": "radio", "options": ["Yes", "No"]},
+    {"label": "Are you willing to relocate?", "type": "radio", "options": ["Yes", "No"]},
+    {"label": "Are you comfortable working in a hybrid setting?", "type": "radio", "options": ["Yes", "No"]},
+    {"label": "Are you comfortable working remotely?", "type": "radio", "options": ["Yes", "No"]},
+    {"label": "What is your notice period?", "type": "text"},
+    {"label": "What is your highest level of education?", "type": "dropdown",
+     "options": ["High School", "Associate's", "Bachelor's", "Master's", "PhD"]},
+    {"label": "Have you completed the following level of education: Bachelor's Degree?",
+     "type": "radio", "options": ["Yes", "No"]},
+    {"label": "What are your salary expectations?", "type": "text"},
+    {"label": "What is your current location?", "type": "text"},
+]
+
+
+def load_catalog(extra_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Built-in catalog plus fields from a JSON list (same keys), without duplicates."""
+    catalog = list(COMMON_QUESTIONS)
+    if extra_path:
+        with open(extra_path, 'r') as f:
+            catalog.extend(json.load(f))
+
+    seen = set()
+    unique = []
+    for field in catalog:
+        if field["label"] not in seen:
+            seen.add(field["label"])
+            unique.append(field)
+    return unique
+
+
+def warm_up_memory(form_filler: Optional[FormFiller] = None,
+                   catalog: Optional[List[Dict[str, Any]]] = None,
+                   force: bool = False) -> int:
+    """
+    Answer the catalog questions that memory lacks or that are stale.
+
+    Returns:
+        int: Number of answers stored
+    """
+    form_filler = form_filler or create_form_filler()
+    return form_filler.warm_up(catalog or load_catalog(), force=force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--catalog", type=Path, help="JSON list of extra fields (label, type, options)")
+    parser.add_argument("--force", action="store_true", help="Re-answer all warm-up questions")
+    args = parser.parse_args()
+
+    stored = warm_up_memory(catalog=load_catalog(args.catalog), force=args.force)
+    print(f"Stored {stored} warm-up answers")
+
+
+if __name__ == "__main__":
+    main()
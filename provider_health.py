@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+from config import Config
+
+class ProviderHealth:
+    """
+    Tracks the health of one LLM provider and acts as its circuit breaker.
+
+    States:
+    - closed: requests flow normally
+    - open: provider is skipped until the cooldown expires
+    - half_open: a single probe request is let through; its outcome
+      closes or re-opens the circuit
+
+    The breaker opens after failure_threshold consecutive failures, or when
+    the rolling success rate drops below min_success_rate.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, window: Optional[int] = None,
+                 ewma_alpha: Optional[float] = None,
+                 failure_threshold: Optional[int] = None,
+                 min_success_rate: Optional[float] = None,
+                 cooldown_seconds: Optional[float] = None):
+        self.window = window or Config.LLM_HEALTH_WINDOW
+        self.ewma_alpha = ewma_alpha or Config.LLM_EWMA_ALPHA
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURE_THRESHOLD
+        self.min_success_rate = min_success_rate if min_success_rate is not None else Config.LLM_BREAKER_MIN_SUCCESS_RATE
+        self.cooldown_seconds = cooldown_seconds if cooldown_seconds is not None else Config.LLM_BREAKER_COOLDOWN_SECONDS
+
+        self._outcomes = deque(maxlen=self.window)
+        self._latencies = deque(maxlen=self.window)  # Successful calls only
+        self._ewma_latency: Optional[float] = None
+        self._last_sample_at = 0.0
+        self._consecutive_failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """State with the open -> half_open transition applied (lock held)."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def is_routable(self) -> bool:
+        """Whether routing should consider this provider at all."""
+        return self.state != self.OPEN
+
+    def acquire(self) -> bool:
+        """
+        Ask permission to send a request.
+
+        Always granted when closed; in half-open state only one probe
+        may be in flight at a time.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release(self):
+        """Give back a permission without recording an outcome (e.g. request cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self._outcomes.append(True)
+            self._latencies.append(latency)
+            self._update_latency(latency)
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self._state = self.CLOSED
+
+    def record_failure(self, latency: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append(False)
+            if latency is not None:
+                self._update_latency(latency)
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+
+            if (self._state == self.HALF_OPEN
+                    or self._consecutive_failures >= self.failure_threshold
+                    or (len(self._outcomes) >= self.failure_threshold
+                        and self._success_rate() < self.min_success_rate)):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def _update_latency(self, latency: float):
+        self._last_sample_at = time.monotonic()
+        if self._ewma_latency is None:
+            self._ewma_latency = latency
+        else:
+            self._ewma_latency = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self._ewma_latency
+
+    def _success_rate(self) -> float:
+        if not self._outcomes:
+            return 1.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def success_rate(self) -> float:
+        with self._lock:
+            return self._success_rate()
+
+    def expected_latency(self) -> Optional[float]:
+        """
+        Expected seconds to get a successful answer, or None if unknown.
+
+        EWMA latency divided by the success rate, so a provider that fails
+        fast does not look better than one that answers slowly. Measurements
+        older than LLM_HEALTH_STALE_SECONDS count as unknown.
+        """
+        with self._lock:
+            if self._ewma_latency is None:
+                return None
+            if time.monotonic() - self._last_sample_at > Config.LLM_HEALTH_STALE_SECONDS:
+                return None
+            return self._ewma_latency / max(self._success_rate(), 0.1)
+
+    def latency_percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Latency of recent successful calls at the given percentile (0-100), or None."""
+        with self._lock:
+            if len(self._latencies) < max(1, min_samples):
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "success_rate": self._success_rate(),
+                "ewma_latency": self._ewma_latency,
+                "consecutive_failures": self._consecutive_failures,
+                "samples": len(self._outcomes)
+            }
@@ -0,0 +1,132 @@
+import asyncio
+import re
+import threading
+import time
+from typing import Optional
+from config import Config
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at a per-minute rate.
+
+    Callers reserve tokens up front and are told how long to wait; the
+    balance may go negative, which queues later callers behind earlier
+    ones instead of letting them race.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # A single request larger than the bucket could never be served otherwise
+            self._tokens -= min(amount, self.capacity)
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def adjust(self, amount: float):
+        """Charge (or refund, if negative) tokens after the fact."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def drain(self):
+        """Empty the bucket so callers resume at the refill rate, not in a burst."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+
+class ProviderRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits for one provider.
+
+    Token cost is reserved from the prompt size before the call and
+    corrected with the reported usage afterwards.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        self._requests = TokenBucket(rpm) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm) if tpm > 0 else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            wait = max(0.0, self._paused_until - time.monotonic())
+        if self._requests:
+            wait = max(wait, self._requests.reserve(1))
+        if self._tokens:
+            wait = max(wait, self._tokens.reserve(tokens))
+        return wait
+
+    def acquire(self, tokens: int, name: str = ""):
+        """Block until a request of about tokens may be sent."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            print(f"Rate limit: waiting {wait:.1f}s for {name or 'provider'}")
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int, name: str = ""):
+        """Async version of acquire()."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            print(f"Rate limit: waiting {wait:.1f}s for {name or 'provider'}")
+            await asyncio.sleep(wait)
+
+    def record_actual(self, reserved: int, actual: int):
+        """Correct the token bucket once the real usage is known."""
+        if self._tokens:
+            self._tokens.adjust(actual - reserved)
+
+    def pause(self, seconds: float):
+        """Back off after the provider itself reported a rate limit (HTTP 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        for bucket in (self._requests, self._tokens):
+            if bucket:
+                bucket.drain()
+
+
+# A bare "429" in a message may be an id or a token count; require the HTTP/status wording
+_RATE_LIMIT_TEXT = re.compile(r"\b(?:http|status(?: code)?|error code)[\s:=]*429\b|rate limit|too many requests",
+                              re.IGNORECASE)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an exception from a provider SDK is an HTTP 429."""
+    response = getattr(error, "response", None)
+    for status in (getattr(error, "status_code", None), getattr(error, "status", None),
+                   getattr(response, "status_code", None)):
+        if status == 429:
+            return True
+    if type(error).__name__ == "RateLimitError":
+        return True
+    return bool(_RATE_LIMIT_TEXT.search(str(error)))
+
+
+def retry_after_seconds(error: Exception) -> float:
+    """Retry-After from the error's HTTP response, or the configured backoff."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return Config.LLM_RATE_LIMIT_BACKOFF
+
+
+# Factory function
+def create_rate_limiter(provider_name: str) -> ProviderRateLimiter:
+    """Factory function to create the limiter for a provider from Config.LLM_RATE_LIMITS."""
+    limits = Config.LLM_RATE_LIMITS.get(provider_name, {})
+    return ProviderRateLimiter(limits.get("rpm", 0), limits.get("tpm", 0))
@@ -0,0 +1,144 @@
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional
+from playwright.async_api import BrowserContext, CDPSession, Page
+from config import Config
+
+
+class RequestStats:
+    """Counters for blocked and loaded requests."""
+
+    def __init__(self):
+        self.blocked = Counter()  # reason -> requests
+        self.blocked_bytes = 0  # Only known in dry-run mode (the requests still load)
+        self.allowed = 0
+        self.loaded_bytes = 0  # Bytes over the network; cache hits add (almost) nothing
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked.values())
+
+    def report(self):
+        print(f"  Blocked {self.blocked_requests} requests ({self.blocked_bytes / 1024:.0f} KB), "
+              f"loaded {self.allowed} ({self.loaded_bytes / 1024:.0f} KB over the network)")
+        for reason, count in self.blocked.most_common():
+            print(f"    {reason:<40} {count:>5}")
+
+
+class RequestPolicy:
+    """
+    Blocks requests the agent does not need, through Chromium's DevTools protocol.
+
+    Requests are blocked by resource type (images, media, fonts) and by URL
+    pattern (ad and analytics hosts). Documents are never blocked. Each page
+    type (login, search, job, easy_apply) can let some blocked types through;
+    the browser sets page_type before navigating.
+
+    Only the blocked types and URLs are intercepted (CDP Fetch patterns), not
+    every request: a catch-all context.route would make Playwright disable
+    the HTTP cache, and LinkedIn's JS/CSS bundles would be downloaded again
+    on every navigation of the long-lived session.
+
+    Byte counts are transfer sizes from the Network domain, so cache hits
+    count as (almost) nothing. Blocked requests never load, so in dry-run
+    mode nothing is intercepted and the size of the requests that would
+    have been blocked is counted as blocked_bytes.
+
+    SOLID Principles:
+    - Single Responsibility: Only decides which requests load
+    - Open/Closed: Types, patterns and allow-lists come from config or the constructor
+    """
+
+    def __init__(self, blocked_types: Optional[Iterable[str]] = None,
+                 blocked_url_patterns: Optional[Iterable[str]] = None,
+                 allowed_types: Optional[Dict[str, List[str]]] = None,
+                 dry_run: Optional[bool] = None):
+        """
+        Args:
+            blocked_types: Resource types to block. If None, uses Config.REQUEST_BLOCKED_TYPES.
+            blocked_url_patterns: URL wildcards to block. If None, uses Config.REQUEST_BLOCKED_URL_PATTERNS.
+            allowed_types: Page type -> blocked types let through. If None, uses Config.REQUEST_ALLOWED_TYPES.
+            dry_run: Count but don't block. If None, uses Config.REQUEST_BLOCKING_DRY_RUN.
+        """
+        self.blocked_types = set(Config.REQUEST_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.blocked_url_patterns = list(Config.REQUEST_BLOCKED_URL_PATTERNS
+                                         if blocked_url_patterns is None else blocked_url_patterns)
+        allowed = Config.REQUEST_ALLOWED_TYPES if allowed_types is None else allowed_types
+        self.allowed_types = {page_type: set(types) for page_type, types in allowed.items()}
+        self.dry_run = Config.REQUEST_BLOCKING_DRY_RUN if dry_run is None else dry_run
+        self.page_type: Optional[str] = None
+        self.stats = RequestStats()
+        self._cdp: Optional[CDPSession] = None
+        self._requests: Dict[str, tuple] = {}  # CDP request id -> (resource type, url)
+
+    async def attach(self, context: BrowserContext, page: Page):
+        """Apply the policy to a page (Chromium only)."""
+        self._cdp = await context.new_cdp_session(page)
+        self._cdp.on("Network.requestWillBeSent", self._on_request)
+        self._cdp.on("Network.loadingFinished", self._on_finished)
+        self._cdp.on("Network.loadingFailed", self._on_failed)
+        self._cdp.on("Fetch.requestPaused", self._on_paused)
+        await self._cdp.send("Network.enable")
+        await self._enable_interception()
+
+    async def set_page_type(self, page_type: str):
+        """Switch to a page type's allow-list before navigating there."""
+        if page_type != self.page_type:
+            self.page_type = page_type
+            await self._enable_interception()
+
+    def _blocked_types_now(self) -> set:
+        return self.blocked_types - self.allowed_types.get(self.page_type, set())
+
+    async def _enable_interception(self):
+        if self._cdp is None or self.dry_run:
+            return
+        patterns = [{"urlPattern": "*", "resourceType": resource_type.capitalize(), "requestStage": "Request"}
+                    for resource_type in sorted(self._blocked_types_now())]
+        patterns += [{"urlPattern": pattern, "requestStage": "Request"} for pattern in self.blocked_url_patterns]
+        if patterns:
+            await self._cdp.send("Fetch.enable", {"patterns": patterns})
+        else:
+            await self._cdp.send("Fetch.disable")
+
+    def block_reason(self, resource_type: str, url: str) -> Optional[str]:
+        """Why a request would be blocked on the current page type, or None to let it through."""
+        resource_type = resource_type.lower()
+        if resource_type == "document":
+            return None
+        if resource_type in self._blocked_types_now():
+            return f"type:{resource_type}"
+        for pattern in self.blocked_url_patterns:
+            if fnmatchcase(url, pattern):
+                return f"url:{pattern}"
+        return None
+
+    async def _on_paused(self, event: Dict[str, Any]):
+        reason = self.block_reason(event.get("resourceType", ""), event["request"]["url"])
+        try:
+            if reason is None:
+                await self._cdp.send("Fetch.continueRequest", {"requestId": event["requestId"]})
+            else:
+                self.stats.blocked[reason] += 1
+                await self._cdp.send("Fetch.failRequest",
+                                     {"requestId": event["requestId"], "errorReason": "BlockedByClient"})
+        except Exception:
+            # The page navigated away or closed while the request was paused
+            pass
+
+    def _on_request(self, event: Dict[str, Any]):
+        self._requests[event["requestId"]] = (event.get("type", ""), event["request"]["url"])
+
+    def _on_finished(self, event: Dict[str, Any]):
+        resource_type, url = self._requests.pop(event["requestId"], ("", ""))
+        size = int(event.get("encodedDataLength") or 0)
+        reason = self.block_reason(resource_type, url) if self.dry_run else None
+        if reason is not None:
+            self.stats.blocked[reason] += 1
+            self.stats.blocked_bytes += size
+        else:
+            self.stats.allowed += 1
+            self.stats.loaded_bytes += size
+
+    def _on_failed(self, event: Dict[str, Any]):
+        self._requests.pop(event["requestId"], None)
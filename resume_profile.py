@@ -0,0 +1,193 @@
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from llm_service import LLMService
+from job_analyzer import ResumeLoader
+from config import Config
+
+class ResumeProfileLoader(ResumeLoader):
+    """
+    Resume loader that returns a compact structured profile instead of the raw text.
+
+    The profile (skills, years per skill, titles, education, work authorization)
+    is extracted by the LLM once per resume content hash and cached on disk
+    next to the resume. Prompts built from load() are then much shorter.
+
+    SOLID Principles:
+    - Liskov Substitution: Drop-in replacement wherever a ResumeLoader is expected
+    - Dependency Inversion: Depends on LLMService abstraction
+    """
+
+    PROFILE_VERSION = "1"
+
+    def __init__(self, resume_path: Path, llm_service: LLMService,
+                 profile_path: Optional[Path] = None):
+        super().__init__(resume_path)
+        self._llm = llm_service
+        self._profile_path = profile_path or Config.RESUME_PROFILE_PATH
+        self._profile: Optional[Dict[str, Any]] = None
+        self._profile_text: Optional[str] = None
+
+    def load(self) -> str:
+        """Return the compact profile text, or the raw resume if extraction fails."""
+        if self._profile_text:
+            return self._profile_text
+
+        profile = self.get_profile()
+        if not profile:
+            return self.load_raw()
+
+        try:
+            self._profile_text = self._render(profile)
+        except Exception as e:
+            print(f"Error rendering resume profile: {e}")
+            return self.load_raw()
+        return self._profile_text
+
+    def load_raw(self) -> str:
+        """Return the full resume text."""
+        return super().load()
+
+    def get_profile(self) -> Optional[Dict[str, Any]]:
+        """Get the structured profile, extracting it if the resume changed."""
+        if self._profile is not None:
+            return self._profile
+
+        resume_hash = self.content_hash()
+        cached = self._read_cache()
+        if (cached and cached.get("resume_hash") == resume_hash
+                and cached.get("profile_version") == self.PROFILE_VERSION):
+            self._profile = self._normalize(cached.get("profile"))
+            if self._profile is not None:
+                return self._profile
+
+        print("Extracting resume profile...")
+        try:
+            profile = self._llm.chat_json(
+                self._build_system_prompt(),
+                self.load_raw(),
+                prefer_smart=True,
+                caller="ResumeProfileLoader"
+            )
+        except Exception as e:
+            print(f"Error extracting resume profile: {e}")
+            return None
+
+        profile = self._normalize(profile)
+        if profile is None:
+            print("Resume profile is not a JSON object, using the raw resume")
+            return None
+
+        self._profile = profile
+        self._write_cache({
+            "resume_hash": resume_hash,
+            "profile_version": self.PROFILE_VERSION,
+            "profile": profile
+        })
+        return self._profile
+
+    def _normalize(self, profile: Any) -> Optional[Dict[str, Any]]:
+        """Coerce an LLM profile into the prompt's shape (lists of strings, skills dict); None if unusable."""
+        if not isinstance(profile, dict):
+            return None
+
+        for key in ("titles", "education", "highlights"):
+            profile[key] = [self._as_text(item) for item in self._as_list(profile.get(key))
+                            if item is not None and self._as_text(item)]
+
+        skills = profile.get("skills") or {}
+        if isinstance(skills, dict):
+            profile["skills"] = {str(skill): years for skill, years in skills.items()}
+        else:
+            profile["skills"] = {self._as_text(skill): None for skill in self._as_list(skills) if skill is not None}
+        return profile
+
+    @staticmethod
+    def _as_list(value: Any) -> List[Any]:
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    @staticmethod
+    def _as_text(item: Any) -> str:
+        """Text for a list item; objects (e.g. {"degree": ..., "institution": ...}) become their joined values."""
+        if isinstance(item, dict):
+            return ", ".join(str(value) for value in item.values() if value not in (None, ""))
+        return str(item)
+
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        if not self._profile_path.exists():
+            return None
+        try:
+            with open(self._profile_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, data: Dict[str, Any]):
+        with open(self._profile_path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def _build_system_prompt(self) -> str:
+        """Build system prompt for profile extraction."""
+        return """You extract a compact, factual profile from a resume.
+Only use information stated in the resume. Use null or empty lists when unknown.
+
+Respond with JSON:
+{
+    "titles": ["most recent job title", "..."],
+    "total_years_experience": <number or null>,
+    "skills": {"<skill>": <years of experience with it, or null>},
+    "education": ["<degree, field, institution>"],
+    "work_authorization": "<stated work authorization / visa status, or null>",
+    "location": "<location or null>",
+    "highlights": ["<up to 5 short, concrete achievements>"]
+}"""
+
+    def _render(self, profile: Dict[str, Any]) -> str:
+        """Render the profile as short prompt text."""
+        lines = []
+
+        titles = profile.get("titles") or []
+        if titles:
+            lines.append(f"Titles: {', '.join(titles)}")
+        if profile.get("total_years_experience") is not None:
+            lines.append(f"Experience: {profile['total_years_experience']} years")
+
+        skills = profile.get("skills") or {}
+        if isinstance(skills, dict):
+            rendered = [f"{skill} ({years}y)" if years else skill for skill, years in skills.items()]
+        else:
+            rendered = [str(skill) for skill in skills]
+        if rendered:
+            lines.append(f"Skills: {', '.join(rendered)}")
+
+        education = profile.get("education") or []
+        if education:
+            lines.append(f"Education: {'; '.join(education)}")
+        if profile.get("work_authorization"):
+            lines.append(f"Work authorization: {profile['work_authorization']}")
+        if profile.get("location"):
+            lines.append(f"Location: {profile['location']}")
+
+        highlights = profile.get("highlights") or []
+        if highlights:
+            lines.append("Highlights:")
+            lines.extend(f"- {item}" for item in highlights)
+
+        return "\n".join(lines)
+
+
+# Factory function
+def create_resume_loader(llm_service: LLMService) -> ResumeLoader:
+    """Factory function to create the resume loader used for prompts."""
+    if Config.RESUME_PROFILE_ENABLED:
+        return ResumeProfileLoader(Config.RESUME_PATH, llm_service)
+    return ResumeLoader(Config.RESUME_PATH)
+
+
+if __name__ == "__main__":
+    # Test
+    from llm_service import create_llm_service
+    loader = create_resume_loader(create_llm_service())
+    print(loader.load())
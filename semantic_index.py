@@ -0,0 +1,132 @@
+import re
+import zlib
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
+
+# Words that mean the same thing in application questions
+_SYNONYMS = {
+    "usa": "us", "america": "us", "u s": "us", "united states": "us", "united states of america": "us",
+    "permitted": "authorized", "eligible": "authorized", "allowed": "authorized",
+    "authorised": "authorized", "authorization": "authorized", "authorisation": "authorized",
+    "legally": "", "lawfully": "",
+    "require": "need", "requires": "need", "needs": "need",
+    "sponsor": "sponsorship", "sponsored": "sponsorship",
+    "yrs": "years", "yr": "years", "year": "years",
+    "experiences": "experience", "experienced": "experience",
+    "relocating": "relocate", "relocation": "relocate",
+    "salary": "compensation", "pay": "compensation",
+    "expectation": "expected", "expectations": "expected",
+}
+_STOPWORDS = {"a", "an", "the", "to", "of", "in", "do", "you", "your", "are", "is", "be",
+              "have", "has", "please", "for", "with", "what", "how", "many", "much", "will"}
+# Wording that does not change what is asked ("Would you ..." / "Are you currently ...")
+_FILLER_WORDS = {"would", "could", "can", "any", "ever", "currently", "now", "future", "on", "at", "this", "role",
+                 "position", "job", "if", "and", "or"}
+# Longest phrases first, so "united states of america" wins over "united states"
+_PHRASES = sorted((k for k in _SYNONYMS if " " in k), key=len, reverse=True)
+
+
+def canonicalize(text: str) -> List[str]:
+    """Lowercase words of text, with synonyms unified and stopwords removed."""
+    text = " " + re.sub(r"[^a-z0-9]+", " ", text.lower()) + " "
+    for phrase in _PHRASES:
+        text = text.replace(f" {phrase} ", f" {_SYNONYMS[phrase]} ")
+    words = [_SYNONYMS.get(word, word) for word in text.split()]
+    return [word for word in words if word and word not in _STOPWORDS]
+
+
+def content_words(text: str) -> FrozenSet[str]:
+    """
+    Words that carry what a question asks about (skills, places, numbers).
+
+    Two questions that differ here ask different things, however similar
+    they look: "years of Python experience" vs "years of Java experience".
+    """
+    return frozenset(word for word in canonicalize(text) if word not in _FILLER_WORDS)
+
+
+class HashedNgramEmbedder:
+    """
+    Local, CPU-only question embedding.
+
+    Questions are canonicalized (synonyms of common application terms,
+    stopwords removed), then words and character 3-5 grams are hashed into
+    a fixed-size vector and L2-normalized, so cosine similarity is a dot product.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashed-ngram-v1-{dim}"
+
+    def canonicalize(self, text: str) -> List[str]:
+        return canonicalize(text)
+
+    def _features(self, text: str) -> Dict[int, float]:
+        words = self.canonicalize(text)
+        features: Dict[int, float] = {}
+
+        def add(token: str, weight: float):
+            index = zlib.crc32(token.encode("utf-8")) % self.dim
+            features[index] = features.get(index, 0.0) + weight
+
+        for word in words:
+            add(f"w:{word}", 2.0)
+            padded = f"<{word}>"
+            for n in (3, 4, 5):
+                for i in range(len(padded) - n + 1):
+                    add(padded[i:i + n], 1.0 / n)
+        for first, second in zip(words, words[1:]):
+            add(f"b:{first} {second}", 1.0)
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as rows of a (len(texts), dim) float32 matrix."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for index, value in self._features(text).items():
+                matrix[row, index] = value
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class SemanticIndex:
+    """
+    Brute-force cosine-similarity index over question embeddings.
+
+    Rows are added or replaced one at a time; the matrix grows by doubling,
+    so incremental updates stay cheap.
+    """
+
+    def __init__(self, dim: int):
+        self._matrix = np.zeros((16, dim), dtype=np.float32)
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, vector: np.ndarray):
+        """Add a vector, replacing the one stored under key if any."""
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            if row == len(self._matrix):
+                self._matrix = np.vstack([self._matrix, np.zeros_like(self._matrix)])
+            self._keys.append(key)
+            self._rows[key] = row
+        self._matrix[row] = vector
+
+    def search(self, vector: np.ndarray,
+               accept: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[str, float]]:
+        """Most similar key (among those accept() allows) and its cosine similarity, or None."""
+        if not self._keys:
+            return None
+        scores = self._matrix[:len(self._keys)] @ vector
+        if accept is None:
+            best = int(np.argmax(scores))
+            return self._keys[best], float(scores[best])
+        for row in np.argsort(-scores):
+            if accept(self._keys[row]):
+                return self._keys[row], float(scores[row])
+        return None
@@ -0,0 +1,113 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database import LLMUsageRecord, init_db
+from config import Config
+
+class UsageTracker:
+    """
+    Accounts LLM token usage and estimated cost per provider and per caller.
+
+    Totals for the current process are kept in memory; if a DB session is
+    given, every request is also persisted to the llm_usage table.
+
+    SOLID Principles:
+    - Single Responsibility: Only records and reports LLM usage
+    - Dependency Inversion: Receives its DB session via the constructor
+    """
+
+    GROUP_COLUMNS = {
+        "provider": LLMUsageRecord.provider,
+        "caller": LLMUsageRecord.caller,
+        "model": LLMUsageRecord.model,
+    }
+
+    def __init__(self, db: Optional[Session] = None):
+        self.db = db
+        self._totals = {by: defaultdict(self._empty) for by in self.GROUP_COLUMNS}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _empty() -> Dict[str, float]:
+        return {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+
+    @staticmethod
+    def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Estimated USD cost from Config.LLM_PRICING (0 for unknown models)."""
+        input_price, output_price = Config.LLM_PRICING.get(model, (0.0, 0.0))
+        return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+    def record(self, provider: str, model: str, caller: Optional[str],
+               prompt_tokens: int, completion_tokens: int) -> float:
+        """
+        Record one request.
+
+        Returns:
+            float: Estimated cost of the request in USD
+        """
+        caller = caller or "unknown"
+        cost = self.estimate_cost(model, prompt_tokens, completion_tokens)
+        keys = {"provider": provider, "caller": caller, "model": model}
+
+        with self._lock:
+            for by, key in keys.items():
+                totals = self._totals[by][key]
+                totals["requests"] += 1
+                totals["prompt_tokens"] += prompt_tokens
+                totals["completion_tokens"] += completion_tokens
+                totals["cost_usd"] += cost
+
+            if self.db is not None:
+                try:
+                    self.db.add(LLMUsageRecord(
+                        provider=provider,
+                        model=model,
+                        caller=caller,
+                        prompt_tokens=prompt_tokens,
+                        completion_tokens=completion_tokens,
+                        cost_usd=cost
+                    ))
+                    self.db.commit()
+                except Exception as e:
+                    self.db.rollback()
+                    print(f"Failed to persist LLM usage: {e}")
+
+        return cost
+
+    def totals(self, by: str = "provider") -> Dict[str, Dict[str, float]]:
+        """Usage in this process, grouped by provider, caller or model."""
+        with self._lock:
+            return {key: dict(values) for key, values in self._totals[by].items()}
+
+    def persisted_totals(self, by: str = "provider") -> Dict[str, Dict[str, float]]:
+        """All-time usage from the database, grouped by provider, caller or model."""
+        if self.db is None:
+            return {}
+
+        column = self.GROUP_COLUMNS[by]
+        with self._lock:
+            rows = self.db.query(
+                column,
+                func.count(LLMUsageRecord.id),
+                func.sum(LLMUsageRecord.prompt_tokens),
+                func.sum(LLMUsageRecord.completion_tokens),
+                func.sum(LLMUsageRecord.cost_usd)
+            ).group_by(column).all()
+
+        return {
+            key: {
+                "requests": requests,
+                "prompt_tokens": prompt_tokens or 0,
+                "completion_tokens": completion_tokens or 0,
+                "cost_usd": cost or 0.0
+            }
+            for key, requests, prompt_tokens, completion_tokens, cost in rows
+        }
+
+
+# Factory function
+def create_usage_tracker() -> UsageTracker:
+    """Factory function to create a UsageTracker persisting to the main DB."""
+    return UsageTracker(init_db())
@@ -0,0 +1,207 @@
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+from playwright.async_api import Page, Request, TimeoutError as PlaywrightTimeoutError
+from config import Config
+
+# Long-lived connections that never "finish" and would keep the page busy forever
+_IGNORED_RESOURCE_TYPES = {"websocket", "eventsource", "media"}
+
+# Polled in the page: true once the number of matches has stayed the same for settle ms
+_COUNT_STABLE_SCRIPT = """
+([selector, settle, token]) => {
+    const state = window.__countStable || (window.__countStable = {});
+    const count = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const last = state[token];
+    if (!last || last.count !== count) {
+        state[token] = {count, since: now};
+        return false;
+    }
+    return count > 0 && now - last.since >= settle;
+}
+"""
+
+# Polled in the page: true once the container's text differs from the snapshot (or it is gone)
+_CHANGED_SCRIPT = """
+([selector, before]) => {
+    const el = document.querySelector(selector);
+    return (el ? el.innerText : null) !== before;
+}
+"""
+
+# Polled in the page: true once a query parameter of the current URL has the given value
+_URL_PARAM_SCRIPT = """
+([name, value]) => new URL(location.href).searchParams.get(name) === value
+"""
+
+
+class WaitTimings:
+    """Time actually spent in each wait, grouped by step name."""
+
+    def __init__(self):
+        self._samples: Dict[str, List[tuple]] = defaultdict(list)  # step -> [(seconds, satisfied)]
+
+    def record(self, step: str, seconds: float, satisfied: bool):
+        self._samples[step].append((seconds, satisfied))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per step: number of waits, total and max seconds, and how many timed out."""
+        return {
+            step: {
+                "count": len(samples),
+                "total": sum(seconds for seconds, _ in samples),
+                "max": max(seconds for seconds, _ in samples),
+                "timeouts": sum(1 for _, satisfied in samples if not satisfied),
+            }
+            for step, samples in self._samples.items()
+        }
+
+    def report(self):
+        for step, stats in self.summary().items():
+            print(f"  {step:<20} {stats['count']:>3} waits  {stats['total']:6.2f}s total  "
+                  f"{stats['max']:5.2f}s max  {stats['timeouts']} timed out")
+
+
+class WaitStrategy:
+    """
+    Waits on concrete readiness conditions instead of fixed sleeps.
+
+    Each wait is named after the step it guards, has its own timeout and is
+    recorded in WaitTimings. A wait that times out returns False rather than
+    raising, so callers decide whether the page is usable anyway.
+
+    SOLID Principles:
+    - Single Responsibility: Only decides when the page is ready
+    - Dependency Inversion: Receives the page and timings via the constructor
+    """
+
+    def __init__(self, page: Page, timings: Optional[WaitTimings] = None,
+                 default_timeout: Optional[int] = None):
+        """
+        Args:
+            page: Playwright page to watch
+            timings: Where wait durations are recorded. If None, a new WaitTimings.
+            default_timeout: ms per wait when a step gives none. If None, uses Config.BROWSER_TIMEOUT.
+        """
+        self.page = page
+        self.timings = timings or WaitTimings()
+        self.default_timeout = default_timeout or Config.BROWSER_TIMEOUT
+        self._in_flight = set()
+        self._last_activity = time.monotonic()
+        page.on("request", self._on_request_start)
+        page.on("requestfinished", self._on_request_end)
+        page.on("requestfailed", self._on_request_end)
+
+    def _on_request_start(self, request: Request):
+        if request.resource_type not in _IGNORED_RESOURCE_TYPES:
+            self._in_flight.add(request)
+            self._last_activity = time.monotonic()
+
+    def _on_request_end(self, request: Request):
+        if request in self._in_flight:
+            self._in_flight.discard(request)
+            self._last_activity = time.monotonic()
+
+    async def _timed(self, step: str, wait) -> bool:
+        start = time.monotonic()
+        satisfied = False
+        try:
+            await wait
+            satisfied = True
+        except PlaywrightTimeoutError:
+            print(f"Wait '{step}' timed out")
+        finally:
+            self.timings.record(step, time.monotonic() - start, satisfied)
+        return satisfied
+
+    async def visible(self, selector: str, step: str, timeout: Optional[int] = None) -> bool:
+        """Wait until an element matching selector is visible."""
+        return await self._timed(step, self.page.wait_for_selector(
+            selector, state="visible", timeout=timeout or self.default_timeout))
+
+    async def network_idle(self, step: str, idle_ms: Optional[int] = None,
+                           timeout: Optional[int] = None) -> bool:
+        """Wait until no request has started or finished for idle_ms."""
+        idle = (idle_ms or Config.BROWSER_NETWORK_IDLE_MS) / 1000
+        deadline = time.monotonic() + (timeout or self.default_timeout) / 1000
+
+        async def wait():
+            while self._in_flight or time.monotonic() - self._last_activity < idle:
+                if time.monotonic() >= deadline:
+                    raise PlaywrightTimeoutError(f"{len(self._in_flight)} requests still in flight")
+                await asyncio.sleep(0.05)
+
+        return await self._timed(step, wait())
+
+    async def count_stable(self, selector: str, step: str, settle_ms: int = 500,
+                           timeout: Optional[int] = None) -> bool:
+        """Wait until the number of elements matching selector (at least one) stops changing."""
+        return await self._timed(step, self.page.wait_for_function(
+            _COUNT_STABLE_SCRIPT, arg=[selector, settle_ms, uuid.uuid4().hex],
+            polling=100, timeout=timeout or self.default_timeout))
+
+    async def url_param(self, name: str, value: str, step: str, timeout: Optional[int] = None) -> bool:
+        """Wait until the page URL's query parameter equals value, e.g. after an in-page (pushState) switch."""
+        return await self._timed(step, self.page.wait_for_function(
+            _URL_PARAM_SCRIPT, arg=[name, value], polling=100,
+            timeout=timeout or self.default_timeout))
+
+    async def snapshot(self, selector: str) -> Optional[str]:
+        """Text of the first element matching selector (None if absent), for changed()."""
+        return await self.page.evaluate(
+            "selector => { const el = document.querySelector(selector); return el ? el.innerText : null; }",
+            selector)
+
+    async def changed(self, selector: str, before: Optional[str], step: str,
+                      timeout: Optional[int] = None) -> bool:
+        """Wait until the element's text differs from a snapshot, e.g. a modal moving to its next step."""
+        return await self._timed(step, self.page.wait_for_function(
+            _CHANGED_SCRIPT, arg=[selector, before], polling=100,
+            timeout=timeout or self.default_timeout))
+
+
+class PacingPolicy:
+    """
+    Explicit human-like pauses before user actions (typing, clicks) and
+    between keystrokes.
+
+    Kept apart from WaitStrategy: readiness waits end as soon as the page is
+    ready, pacing is a deliberate delay that can be tuned or turned off.
+    """
+
+    def __init__(self, min_delay: Optional[float] = None, max_delay: Optional[float] = None,
+                 enabled: Optional[bool] = None, keystroke_min: Optional[float] = None,
+                 keystroke_max: Optional[float] = None):
+        """
+        Args:
+            min_delay: Shortest pause in seconds. If None, uses Config.BROWSER_PACING_MIN.
+            max_delay: Longest pause in seconds. If None, uses Config.BROWSER_PACING_MAX.
+            enabled: If None, uses Config.BROWSER_PACING.
+            keystroke_min: Shortest pause between keystrokes. If None, uses Config.BROWSER_KEYSTROKE_MIN.
+            keystroke_max: Longest pause between keystrokes. If None, uses Config.BROWSER_KEYSTROKE_MAX.
+        """
+        self.min_delay = Config.BROWSER_PACING_MIN if min_delay is None else min_delay
+        self.max_delay = Config.BROWSER_PACING_MAX if max_delay is None else max_delay
+        self.enabled = Config.BROWSER_PACING if enabled is None else enabled
+        self.keystroke_min = Config.BROWSER_KEYSTROKE_MIN if keystroke_min is None else keystroke_min
+        self.keystroke_max = Config.BROWSER_KEYSTROKE_MAX if keystroke_max is None else keystroke_max
+        self.total = 0.0
+
+    async def pause(self):
+        """Sleep a random time between min_delay and max_delay (no-op when disabled)."""
+        await self._sleep(self.min_delay, self.max_delay)
+
+    async def keystroke(self):
+        """Sleep a random time between keystroke_min and keystroke_max (no-op when disabled)."""
+        await self._sleep(self.keystroke_min, self.keystroke_max)
+
+    async def _sleep(self, low: float, high: float):
+        if not self.enabled:
+            return
+        delay = random.uniform(low, high)
+        self.total += delay
+        await asyncio.sleep(delay)